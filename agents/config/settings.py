@@ -3,72 +3,196 @@ Application settings and configuration management.
 """
 
 import os
-from typing import Optional
-from pydantic_settings import BaseSettings
-from pydantic import Field
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+from dotenv import load_dotenv
 
 
-class Settings(BaseSettings):
+_dotenv_lock = threading.Lock()
+_dotenv_loaded = False
+
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+
+
+def _load_dotenv_once() -> None:
+    """Merge .env into the environment (without overriding it) once per process."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    with _dotenv_lock:
+        if not _dotenv_loaded:
+            load_dotenv(".env", encoding="utf-8", override=False)
+            _dotenv_loaded = True
+
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    return os.environ.get(name, default)
+
+
+def _env_required(name: str) -> str:
+    value = os.environ.get(name)
+    if value is None:
+        raise ValueError(f"Missing required environment variable: {name}")
+    return value
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in _TRUE_VALUES
+
+
+@dataclass(slots=True, frozen=True)
+class Settings:
     """Application settings loaded from environment variables."""
 
+    # LiveKit
+    livekit_url: str
+    livekit_api_key: str
+    livekit_api_secret: str
+
+    # Backend API
+    backend_api_url: str
+    backend_api_key: str
+    # Connections kept open to the backend (total and per host)
+    backend_pool_size: int = 100
+    backend_pool_per_host: int = 100
+    # "h2" multiplexes backend calls over HTTP/2 (httpx); otherwise HTTP/1.1
+    backend_http_version: str = "1.1"
+
     # Application
     app_name: str = "Voice Assistant"
-    environment: str = Field(default="development", env="ENVIRONMENT")
-    debug: bool = Field(default=False, env="DEBUG")
-    
-    # LiveKit
-    livekit_url: str = Field(..., env="LIVEKIT_URL")
-    livekit_api_key: str = Field(..., env="LIVEKIT_API_KEY")
-    livekit_api_secret: str = Field(..., env="LIVEKIT_API_SECRET")
-    
+    environment: str = "development"
+    debug: bool = False
+
     # STT Provider Configuration
-    stt_provider: str = Field(default="openai", env="STT_PROVIDER")
-    stt_model: Optional[str] = Field(default=None, env="STT_MODEL")
-    stt_language: str = Field(default="en-US", env="STT_LANGUAGE")
-    
+    stt_provider: str = "openai"
+    stt_model: Optional[str] = None
+    stt_language: str = "en-US"
+
     # LLM Provider Configuration
-    llm_provider: str = Field(default="openai", env="LLM_PROVIDER")
-    llm_model: str = Field(default="gpt-4", env="LLM_MODEL")
-    llm_temperature: float = Field(default=0.7, env="LLM_TEMPERATURE")
-    llm_max_tokens: int = Field(default=150, env="LLM_MAX_TOKENS")
-    llm_system_prompt: str = Field(
-        default="You are a helpful voice assistant. Keep responses concise and natural.",
-        env="LLM_SYSTEM_PROMPT"
-    )
-    
+    llm_provider: str = "openai"
+    llm_model: str = "gpt-4"
+    llm_temperature: float = 0.7
+    llm_max_tokens: int = 150
+    llm_system_prompt: str = "You are a helpful voice assistant. Keep responses concise and natural."
+    preemptive_generation: bool = True
+
     # TTS Provider Configuration
-    tts_provider: str = Field(default="openai", env="TTS_PROVIDER")
-    tts_model: Optional[str] = Field(default="tts-1", env="TTS_MODEL")
-    tts_voice: str = Field(default="alloy", env="TTS_VOICE")
-    
-    # API Keys for AI Providers
-    openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
-    azure_speech_key: Optional[str] = Field(default=None, env="AZURE_SPEECH_KEY")
-    azure_speech_region: Optional[str] = Field(default=None, env="AZURE_SPEECH_REGION")
-    azure_openai_key: Optional[str] = Field(default=None, env="AZURE_OPENAI_KEY")
-    azure_openai_endpoint: Optional[str] = Field(default=None, env="AZURE_OPENAI_ENDPOINT")
-    aws_access_key: Optional[str] = Field(default=None, env="AWS_ACCESS_KEY_ID")
-    aws_secret_key: Optional[str] = Field(default=None, env="AWS_SECRET_ACCESS_KEY")
-    aws_region: Optional[str] = Field(default="us-east-1", env="AWS_REGION")
-    google_credentials_path: Optional[str] = Field(default=None, env="GOOGLE_CREDENTIALS_PATH")
-    anthropic_api_key: Optional[str] = Field(default=None, env="ANTHROPIC_API_KEY")
-    
-    # Backend API
-    backend_api_url: str = Field(..., env="BACKEND_API_URL")
-    backend_api_key: str = Field(..., env="BACKEND_API_KEY")
-    
+    tts_provider: str = "openai"
+    tts_model: Optional[str] = "tts-1"
+    tts_voice: str = "alloy"
+
+    # Number of conversation messages kept in memory per session
+    history_window: int = 1000
+
+    # API keys for AI providers are resolved lazily, see ProviderSecrets
+
     # Redis
-    redis_url: Optional[str] = Field(default=None, env="REDIS_URL")
-    
+    redis_url: Optional[str] = None
+
     # Logging
-    log_level: str = Field(default="INFO", env="LOG_LEVEL")
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    log_level: str = "INFO"
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Build settings from the process environment and the .env file.
+
+        Raises ValueError if a required variable is missing or malformed.
+        """
+        _load_dotenv_once()
+        return cls(
+            livekit_url=_env_required("LIVEKIT_URL"),
+            livekit_api_key=_env_required("LIVEKIT_API_KEY"),
+            livekit_api_secret=_env_required("LIVEKIT_API_SECRET"),
+            backend_api_url=_env_required("BACKEND_API_URL"),
+            backend_api_key=_env_required("BACKEND_API_KEY"),
+            backend_pool_size=int(_env("BACKEND_POOL_SIZE", "100")),
+            backend_pool_per_host=int(_env("BACKEND_POOL_PER_HOST", "100")),
+            backend_http_version=_env("BACKEND_HTTP_VERSION", "1.1"),
+            app_name=_env("APP_NAME", "Voice Assistant"),
+            environment=_env("ENVIRONMENT", "development"),
+            debug=_env_bool("DEBUG", False),
+            stt_provider=_env("STT_PROVIDER", "openai"),
+            stt_model=_env("STT_MODEL"),
+            stt_language=_env("STT_LANGUAGE", "en-US"),
+            llm_provider=_env("LLM_PROVIDER", "openai"),
+            llm_model=_env("LLM_MODEL", "gpt-4"),
+            llm_temperature=float(_env("LLM_TEMPERATURE", "0.7")),
+            llm_max_tokens=int(_env("LLM_MAX_TOKENS", "150")),
+            llm_system_prompt=_env(
+                "LLM_SYSTEM_PROMPT",
+                "You are a helpful voice assistant. Keep responses concise and natural."
+            ),
+            preemptive_generation=_env_bool("PREEMPTIVE_GENERATION", True),
+            tts_provider=_env("TTS_PROVIDER", "openai"),
+            tts_model=_env("TTS_MODEL", "tts-1"),
+            tts_voice=_env("TTS_VOICE", "alloy"),
+            history_window=int(_env("HISTORY_WINDOW", "1000")),
+            redis_url=_env("REDIS_URL"),
+            log_level=_env("LOG_LEVEL", "INFO"),
+        )
+
 
+class ProviderSecrets:
+    """
+    API keys for AI providers, read from the environment on first access.
 
+    A job only talks to the providers it was configured with, so keys for
+    the others are never looked up. Resolved values are cached on the
+    instance.
+    """
+
+    _ENV_VARS: Dict[str, str] = {
+        "openai_api_key": "OPENAI_API_KEY",
+        "azure_speech_key": "AZURE_SPEECH_KEY",
+        "azure_speech_region": "AZURE_SPEECH_REGION",
+        "azure_openai_key": "AZURE_OPENAI_KEY",
+        "azure_openai_endpoint": "AZURE_OPENAI_ENDPOINT",
+        "azure_openai_deployment": "AZURE_OPENAI_DEPLOYMENT",
+        "azure_openai_api_version": "AZURE_OPENAI_API_VERSION",
+        "aws_access_key": "AWS_ACCESS_KEY_ID",
+        "aws_secret_key": "AWS_SECRET_ACCESS_KEY",
+        "aws_region": "AWS_REGION",
+        "google_credentials_path": "GOOGLE_CREDENTIALS_PATH",
+        "anthropic_api_key": "ANTHROPIC_API_KEY",
+    }
+    _DEFAULTS: Dict[str, str] = {
+        "aws_region": "us-east-1",
+    }
+
+    def __getattr__(self, name: str) -> Optional[str]:
+        try:
+            env_var = self._ENV_VARS[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        value = os.environ.get(env_var, self._DEFAULTS.get(name))
+        setattr(self, name, value)
+        return value
+
+
+@lru_cache(maxsize=1)
+def get_provider_secrets() -> ProviderSecrets:
+    """
+    Get the provider secrets singleton.
+
+    Values from .env are merged into the environment (without overriding
+    it) so lookups see the same sources as Settings.
+    """
+    _load_dotenv_once()
+    return ProviderSecrets()
+
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings singleton."""
-    return Settings()
+    """
+    Get application settings singleton.
+
+    The environment and .env file are parsed once per process; call
+    ``get_settings.cache_clear()`` (e.g. in tests) to force a reload.
+    """
+    return Settings.from_env()
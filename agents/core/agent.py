@@ -6,19 +6,29 @@ No manual audio buffering or chunk management is required - LiveKit handles it a
 """
 
 import asyncio
+import itertools
 import logging
-import json
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Deque, Dict, Any, Iterable, List, Tuple
 
 from livekit.agents import (
     Agent,
     AgentSession,
     AutoSubscribe, 
     JobContext, 
+    JobProcess,
     WorkerOptions, 
     cli,
     RoomInputOptions,
+    StopResponse,
     UserInputTranscribedEvent,
     ConversationItemAddedEvent,
     SpeechCreatedEvent,
@@ -27,15 +37,25 @@ from livekit.agents import (
     ErrorEvent
 )
 from livekit.agents import llm
+from livekit.plugins import silero
+import orjson
 
 from opentelemetry import metrics
+from opentelemetry.metrics import (
+    CallbackOptions,
+    Counter,
+    Histogram,
+    ObservableGauge,
+    Observation,
+    UpDownCounter
+)
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import (
     ConsoleMetricExporter,
     PeriodicExportingMetricReader
 )
 from opentelemetry.exporter.prometheus import PrometheusMetricReader
-from opentelemetry.sdk.metrics.view import View
+from opentelemetry.sdk.metrics.view import ExponentialBucketHistogramAggregation, View
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.semconv.resource import ResourceAttributes
 
@@ -44,29 +64,124 @@ from .providers.base import (
     STTConfig, LLMConfig, TTSConfig,
     LLMMessage, ProviderType
 )
-from .config.settings import Settings
+from .config.settings import ProviderSecrets, Settings, get_provider_secrets, get_settings
 from .services.backend_client import BackendClient
 
+try:
+    import uvloop
+except ImportError:  # not installed, or unsupported platform (Windows)
+    uvloop = None
+
 
 logger = logging.getLogger(__name__)
 
+# Prefer uvloop's faster event loop when it is installed. Job processes are
+# spawned and import this module as __mp_main__ rather than running it as
+# __main__, so the policy is set at import time to apply to their loops too.
+# Only the worker's entry module does this: importing agents.core.agent from
+# tests, the backend or tooling leaves the caller's loop policy alone.
+if uvloop is not None and __name__ in ("__main__", "__mp_main__"):
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
-class VoiceAssistantAgent(Agent):
+# How often queued backend writes are flushed as a batch (seconds)
+_WRITE_FLUSH_INTERVAL = 0.05
+
+# Events queued beyond this while the backend is slow are dropped, not buffered
+_WRITE_QUEUE_MAXSIZE = 1024
+
+# Hesitation fillers that never warrant an LLM reply. Affirmatives such as
+# "uh-huh" or "mm-hmm" are answers to the agent and must still get one.
+_FILLER_RE = re.compile(r"^\s*(?:u+h+|u+m+|h+m+)\W*$", re.IGNORECASE)
+
+# How long a user turn may wait for backend context before the reply starts
+_CONTEXT_TIMEOUT = 0.15
+
+# Upper bound on tracked participant states; least recently seen are evicted
+_PARTICIPANT_STATES_MAXLEN = 512
+
+
+@lru_cache(maxsize=128)
+def _parse_metadata(raw: str) -> Dict[str, Any]:
     """
-    Main voice assistant agent that orchestrates STT, LLM, and TTS providers.
-    Uses LiveKit's native event system and state management.
-    
-    Inherits from LiveKit's Agent class to properly integrate with the LiveKit ecosystem.
-    
-    State is managed through:
-    - LiveKit room.metadata for room-level state
-    - LiveKit participant.metadata for user context
-    - In-memory conversation history for current session
-    - Backend API for persistent storage
+    Parse room/job metadata JSON, memoized per distinct metadata string.
+
+    The returned dict is shared between callers and must be treated as read-only.
     """
+    return orjson.loads(raw)
+
+
+def _approx_tokens(text: str) -> int:
+    """Approximate a token count as a word count without allocating a list."""
+    return text.count(" ") + 1 if text else 0
+
+
+@dataclass(slots=True)
+class ParticipantState:
+    """Compact per-participant record kept for the session."""
+    language: Optional[str] = None
+    final_transcripts: int = 0
+    last_seen: float = 0.0
+
+
+@dataclass(slots=True)
+class MetricHandles:
+    """Typed container for the process-wide metric instruments."""
+    stt_latency: Histogram
+    stt_confidence: Histogram
+    stt_interim_results: Counter
+    stt_final_results: Counter
+    llm_latency: Histogram
+    llm_tokens: UpDownCounter
+    llm_response_tokens: Histogram
+    tts_requests: Counter
+    tts_characters: Counter
+    tts_latency: Histogram
+    tts_audio_duration: Histogram
+    errors: Counter
+    session_duration: ObservableGauge
+
+
+# Case-insensitive provider name -> ProviderType, resolved without enum lookups
+_PROVIDER_LOOKUP: Dict[str, ProviderType] = dict(ProviderType.__members__)
+
+
+def _provider_metadata(provider: ProviderType, secrets: ProviderSecrets) -> Dict[str, Any]:
+    """Build provider config metadata, reading only the selected provider's keys."""
+    if provider == ProviderType.AZURE:
+        metadata = {
+            "api_key": secrets.azure_openai_key,
+            "azure_endpoint": secrets.azure_openai_endpoint,
+            # None routes requests by model name, i.e. a deployment per model
+            "azure_deployment": secrets.azure_openai_deployment
+        }
+        # Otherwise the factory's default API version applies
+        if secrets.azure_openai_api_version:
+            metadata["api_version"] = secrets.azure_openai_api_version
+        return metadata
+    return {"api_key": secrets.openai_api_key}
+
+
+# Process-wide OpenTelemetry state. The MeterProvider and its instruments are
+# created once per worker process and shared by every agent instance; agents
+# only contribute their own attributes.
+_metrics_lock = threading.Lock()
+_metrics: Optional[MetricHandles] = None
+_active_agents: "weakref.WeakSet[VoiceAssistantAgent]" = weakref.WeakSet()
+
+
+def _observe_session_durations(options: CallbackOptions) -> Iterable[Observation]:
+    """Report the current session duration of every live agent."""
+    for agent in list(_active_agents):
+        yield Observation(agent._session_duration(), agent._base_attributes)
+
+
+def _init_metrics(debug: bool) -> MetricHandles:
+    """Initialize OpenTelemetry metrics once per process and return the instruments."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is not None:
+            return _metrics
 
-    def _setup_metrics(self):
-        """Initialize OpenTelemetry metrics."""
         # Create resource for the agent
         resource = Resource.create({
             ResourceAttributes.SERVICE_NAME: "voice_assistant",
@@ -74,22 +189,25 @@ class VoiceAssistantAgent(Agent):
             "agent.type": "voice_assistant",
         })
 
-        # Set up metric readers
-        prometheus_reader = PrometheusMetricReader()
-        console_reader = PeriodicExportingMetricReader(
-            ConsoleMetricExporter(),
-            export_interval_millis=5000
-        )
+        # Set up metric readers; console export is only useful while debugging
+        metric_readers = [PrometheusMetricReader()]
+        if debug:
+            metric_readers.append(
+                PeriodicExportingMetricReader(
+                    ConsoleMetricExporter(),
+                    export_interval_millis=5000
+                )
+            )
 
         # Create and set meter provider
         provider = MeterProvider(
             resource=resource,
-            metric_readers=[prometheus_reader, console_reader],
+            metric_readers=metric_readers,
             views=[
                 # Custom views for specific metrics if needed
                 View(
                     instrument_name="stt_latency",
-                    aggregation=metrics.ExponentialHistogram()
+                    aggregation=ExponentialBucketHistogramAggregation()
                 )
             ]
         )
@@ -98,84 +216,101 @@ class VoiceAssistantAgent(Agent):
         # Create meter for our agent
         meter = metrics.get_meter("voice_assistant")
 
-        # STT Metrics
-        self.metrics.stt_latency = meter.create_histogram(
-            name="stt_latency",
-            description="Speech-to-text transcription latency",
-            unit="s"
-        )
-        self.metrics.stt_confidence = meter.create_histogram(
-            name="stt_confidence",
-            description="Speech-to-text confidence scores",
-            unit="1"
-        )
-        self.metrics.stt_interim_results = meter.create_counter(
-            name="stt_interim_results",
-            description="Number of interim STT results"
-        )
-        self.metrics.stt_final_results = meter.create_counter(
-            name="stt_final_results",
-            description="Number of final STT results"
-        )
+        _metrics = MetricHandles(
+            # STT Metrics
+            stt_latency=meter.create_histogram(
+                name="stt_latency",
+                description="Speech-to-text transcription latency",
+                unit="s"
+            ),
+            stt_confidence=meter.create_histogram(
+                name="stt_confidence",
+                description="Speech-to-text confidence scores",
+                unit="1"
+            ),
+            stt_interim_results=meter.create_counter(
+                name="stt_interim_results",
+                description="Number of interim STT results"
+            ),
+            stt_final_results=meter.create_counter(
+                name="stt_final_results",
+                description="Number of final STT results"
+            ),
 
-        # LLM Metrics
-        self.metrics.llm_latency = meter.create_histogram(
-            name="llm_latency",
-            description="LLM response generation latency",
-            unit="s"
-        )
-        self.metrics.llm_tokens = meter.create_up_down_counter(
-            name="llm_tokens",
-            description="Total tokens processed by LLM",
-            unit="1"
-        )
-        self.metrics.llm_response_tokens = meter.create_histogram(
-            name="llm_response_tokens",
-            description="Number of tokens in LLM responses",
-            unit="1"
-        )
+            # LLM Metrics
+            llm_latency=meter.create_histogram(
+                name="llm_latency",
+                description="LLM response generation latency",
+                unit="s"
+            ),
+            llm_tokens=meter.create_up_down_counter(
+                name="llm_tokens",
+                description="Total tokens processed by LLM",
+                unit="1"
+            ),
+            llm_response_tokens=meter.create_histogram(
+                name="llm_response_tokens",
+                description="Number of tokens in LLM responses",
+                unit="1"
+            ),
 
-        # TTS Metrics
-        self.metrics.tts_latency = meter.create_histogram(
-            name="tts_latency",
-            description="Text-to-speech synthesis latency",
-            unit="s"
-        )
-        self.metrics.tts_audio_duration = meter.create_histogram(
-            name="tts_audio_duration",
-            description="Duration of synthesized audio",
-            unit="s"
-        )
+            # TTS Metrics
+            tts_requests=meter.create_counter(
+                name="tts_requests",
+                description="Number of TTS speech generations",
+                unit="1"
+            ),
+            tts_characters=meter.create_counter(
+                name="tts_characters",
+                description="Number of characters sent to TTS",
+                unit="1"
+            ),
+            tts_latency=meter.create_histogram(
+                name="tts_latency",
+                description="Text-to-speech synthesis latency",
+                unit="s"
+            ),
+            tts_audio_duration=meter.create_histogram(
+                name="tts_audio_duration",
+                description="Duration of synthesized audio",
+                unit="s"
+            ),
 
-        # Error Metrics with attributes
-        self.metrics.errors = meter.create_counter(
-            name="errors",
-            description="Number of errors by type",
-            unit="1"
-        )
+            # Error Metrics with attributes
+            errors=meter.create_counter(
+                name="errors",
+                description="Number of errors by type",
+                unit="1"
+            ),
 
-        # Session Metrics
-        self.metrics.session_duration = meter.create_observable_gauge(
-            name="session_duration",
-            description="Current session duration",
-            unit="s",
-            callbacks=[self._get_session_duration]
+            # Session Metrics, observed across all live agents
+            session_duration=meter.create_observable_gauge(
+                name="session_duration",
+                description="Current session duration",
+                unit="s",
+                callbacks=[_observe_session_durations]
+            )
         )
+        return _metrics
 
-        # Performance Attributes
-        self.metrics.attributes = {
-            "provider.stt": getattr(self.stt_config, "provider", "unknown").value,
-            "provider.llm": getattr(self.llm_config, "provider", "unknown").value,
-            "provider.tts": getattr(self.tts_config, "provider", "unknown").value,
-            "model.stt": getattr(self.stt_config, "model", "unknown"),
-            "model.llm": getattr(self.llm_config, "model", "unknown"),
-            "model.tts": getattr(self.tts_config, "model", "unknown")
-        }
 
-    def _get_session_duration(self, callback):
-        """Callback for observable session duration metric."""
-        duration = (datetime.utcnow() - self.session_start).total_seconds()
-        callback.observe(duration, self.metrics.attributes)
+class VoiceAssistantAgent(Agent):
+    """
+    Main voice assistant agent that orchestrates STT, LLM, and TTS providers.
+    Uses LiveKit's native event system and state management.
+    
+    Inherits from LiveKit's Agent class to properly integrate with the LiveKit ecosystem.
+    
+    State is managed through:
+    - LiveKit room.metadata for room-level state
+    - LiveKit participant.metadata for user context
+    - In-memory conversation history for current session
+    - Backend API for persistent storage
+    """
+
+    def _session_duration(self) -> float:
+        """Seconds elapsed since this agent's session started."""
+        return time.monotonic() - self._t0_mono
         
     def __init__(
         self,
@@ -199,44 +334,201 @@ class VoiceAssistantAgent(Agent):
         self.stt_config = stt_config
         self.llm_config = llm_config
         self.tts_config = tts_config
+
+        # Provider/model names are invariant for the session; resolve them once
+        self._stt_model_str = getattr(stt_config, "model", None) or "unknown"
+        self._stt_provider_str = str(getattr(stt_config, "provider", None) or "unknown")
+        self._llm_model_str = getattr(llm_config, "model", None) or "unknown"
+        self._llm_provider_str = str(getattr(llm_config, "provider", None) or "unknown")
+        self._tts_model_str = getattr(tts_config, "model", None) or "unknown"
+        self._tts_provider_str = str(getattr(tts_config, "provider", None) or "unknown")
+        
+        # Shared metric instruments plus this session's performance attributes.
+        # The attributes are invariant for the lifetime of the session, so the
+        # handlers reuse a read-only view of them.
+        self.metrics = _init_metrics(settings.debug)
+        self._base_attributes = MappingProxyType({
+            "provider.stt": self._stt_provider_str,
+            "provider.llm": self._llm_provider_str,
+            "provider.tts": self._tts_provider_str,
+            "model.stt": self._stt_model_str,
+            "model.llm": self._llm_model_str,
+            "model.tts": self._tts_model_str
+        })
         
-        # Initialize metrics (uses config info for attributes)
-        self._setup_metrics()
+        self._interim_attrs_cache: Dict[tuple, Dict[str, Any]] = {}
         
         # Session state
-        self.conversation_history: List[LLMMessage] = []
-        self.session_start = datetime.utcnow()
+        # Bounded history; the counters track which messages still need saving
+        self.conversation_history: Deque[LLMMessage] = deque(maxlen=settings.history_window)
+        self._total_appended = 0
+        self._last_saved_idx = 0
+        self._history_flush_task: Optional[asyncio.Task] = None
+        # Wall-clock anchor for reporting; durations use the monotonic clock
+        self.session_start = datetime.now(timezone.utc)
+        self._t0_mono = time.monotonic()
+        _active_agents.add(self)
         self.conversation_id: Optional[str] = None
-        self.participant_states: Dict[str, Dict[str, Any]] = {}
+        self.participant_states: "OrderedDict[str, ParticipantState]" = OrderedDict()
         
         # Performance tracking
         self.total_stt_latency = 0.0
         self.total_llm_latency = 0.0
         self.total_tts_latency = 0.0
         self.request_count = 0
+        
+        # Backend writes are queued by the event handlers and flushed in
+        # batches by _flush_loop, started on the first queued write
+        self._write_queue: asyncio.Queue = asyncio.Queue(maxsize=_WRITE_QUEUE_MAXSIZE)
+        self._write_ready = asyncio.Event()
+        self._flusher_task: Optional[asyncio.Task] = None
+
+        # (event, handler) pairs currently subscribed on the session
+        self._handlers: tuple = ()
+
+    def _enqueue_write(self, kind: str, body: Dict[str, Any]) -> None:
+        """
+        Queue a conversation event for the next batched backend write.
+
+        The event is stamped now, so batching does not delay or merge times.
+        """
+        try:
+            self._write_queue.put_nowait((self.conversation_id, kind, body, time.time_ns()))
+        except asyncio.QueueFull:
+            logger.warning("Backend write queue full, dropping %s event", kind)
+        self._write_ready.set()
+        if self._flusher_task is None:
+            self._flusher_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Drain queued events into batched backend writes, idling while there are none."""
+        while True:
+            await self._write_ready.wait()
+            # Let the batch fill for one window before sending it
+            await asyncio.sleep(_WRITE_FLUSH_INTERVAL)
+            self._write_ready.clear()
+            # Shield so cancelling the loop never drops an in-flight batch
+            await asyncio.shield(self._flush_writes())
+
+    async def _flush_writes(self) -> None:
+        """Send everything currently queued in a single batch."""
+        queue = self._write_queue
+        if queue.empty():
+            return
+        batch = [queue.get_nowait() for _ in range(queue.qsize())]
+        await self.backend_client.store_batch(batch)
+
+    def _touch_participant(self, participant_id: str) -> ParticipantState:
+        """Return the state for a participant, marking it most recently seen."""
+        states = self.participant_states
+        state = states.get(participant_id)
+        if state is None:
+            state = states[participant_id] = ParticipantState()
+            if len(states) > _PARTICIPANT_STATES_MAXLEN:
+                states.popitem(last=False)
+        else:
+            states.move_to_end(participant_id)
+        state.last_seen = time.monotonic()
+        return state
+
+    def _append_history(self, message: LLMMessage) -> None:
+        """Append a message produced in this session to the history."""
+        history = self.conversation_history
+        history.append(message)
+        self._total_appended += 1
+
+        # Persist unsaved messages in the background well before the bounded
+        # history starts evicting them
+        if (
+            self.conversation_id
+            and self.backend_client
+            and self._total_appended - self._last_saved_idx >= history.maxlen // 2
+            and (self._history_flush_task is None or self._history_flush_task.done())
+        ):
+            messages, saved_up_to = self._unsaved_messages()
+            self._history_flush_task = asyncio.create_task(
+                self._send_messages(messages, saved_up_to)
+            )
+
+    def _insert_loaded_history(self, messages: List[LLMMessage], newer: int) -> None:
+        """
+        Add already persisted messages ahead of the ``newer`` most recent ones.
+
+        Items appended while the history was being fetched (e.g. the greeting)
+        stay at the end, so they are still the ones _unsaved_messages picks up.
+        """
+        history = self.conversation_history
+        newest = [history.pop() for _ in range(min(newer, len(history)))]
+        history.extend(messages)
+        history.extend(reversed(newest))
+        # Already persisted, so these do not count towards the next save
+        self._total_appended += len(messages)
+        self._last_saved_idx += len(messages)
+
+    def _unsaved_messages(self) -> tuple:
+        """Snapshot the messages appended since the last successful save."""
+        unsaved = self._total_appended - self._last_saved_idx
+        if unsaved <= 0:
+            return [], self._total_appended
+        history = self.conversation_history
+        start = max(0, len(history) - unsaved)
+        return list(itertools.islice(history, start, None)), self._total_appended
+
+    async def _send_messages(self, messages: List[LLMMessage], saved_up_to: int) -> None:
+        if messages and await self.backend_client.append_conversation_messages(
+            conversation_id=self.conversation_id,
+            new_messages=messages
+        ):
+            self._last_saved_idx = max(self._last_saved_idx, saved_up_to)
+
+    async def _save_conversation_state(self) -> None:
+        """Send only the messages appended since the last successful save."""
+        if self._history_flush_task:
+            # Let an in-flight background save land first to avoid duplicates
+            await asyncio.wait((self._history_flush_task,))
+            self._history_flush_task = None
+        await self._send_messages(*self._unsaved_messages())
+
+    def _register_handlers(self) -> None:
+        """Subscribe to session events, at most once per session entry."""
+        if self._handlers:
+            return
+        self._handlers = (
+            ("user_input_transcribed", self._handle_transcription),
+            ("conversation_item_added", self._handle_conversation_item),
+            ("speech_created", self._handle_speech_created),
+            ("agent_state_changed", self._handle_agent_state),
+            ("user_state_changed", self._handle_user_state),
+            ("error", self._handle_error),
+        )
+        for event, handler in self._handlers:
+            self.session.on(event, handler)
+
+    def _unregister_handlers(self) -> None:
+        """Remove the session event handlers added by _register_handlers."""
+        for event, handler in self._handlers:
+            self.session.off(event, handler)
+        self._handlers = ()
 
     async def on_enter(self) -> None:
         """Called when the agent becomes active in a session."""
         logger.info("Agent becoming active in session")
         
         # Set up LiveKit event handlers in the session
-        self.session.on("user_input_transcribed", self._handle_transcription)
-        self.session.on("conversation_item_added", self._handle_conversation_item)
-        self.session.on("speech_created", self._handle_speech_created)
-        self.session.on("agent_state_changed", self._handle_agent_state)
-        self.session.on("user_state_changed", self._handle_user_state)
-        self.session.on("error", self._handle_error)
+        self._register_handlers()
         
         # Load context from room metadata
         if self.session.room.metadata:
             try:
-                room_data = json.loads(self.session.room.metadata)
+                room_data = _parse_metadata(self.session.room.metadata)
                 self.conversation_id = room_data.get("conversation_id")
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.error("Failed to parse room metadata")
         
-        # Greet the user with a warm welcome
-        await self.session.generate_reply(
+        # Greet the user with a warm welcome; the greeting is scheduled right
+        # away and plays while the history fetch below is in flight
+        appended_before = self._total_appended
+        greeting = self.session.generate_reply(
             instructions="Greet the user with a warm welcome"
         )
         
@@ -247,8 +539,13 @@ class VoiceAssistantAgent(Agent):
                 limit=10
             )
             if recent_messages:
-                self.conversation_history.extend(recent_messages)
-                logger.info(f"Loaded {len(recent_messages)} recent messages from backend")
+                self._insert_loaded_history(
+                    recent_messages,
+                    self._total_appended - appended_before
+                )
+                logger.info("Loaded %d recent messages from backend", len(recent_messages))
+
+        await greeting
 
     async def on_exit(self) -> None:
         """Called before the agent gives control to another agent."""
@@ -259,10 +556,11 @@ class VoiceAssistantAgent(Agent):
         
         # Save conversation state if needed
         if self.backend_client and self.conversation_id:
-            await self.backend_client.save_conversation_state(
-                conversation_id=self.conversation_id,
-                messages=self.conversation_history
-            )
+            await self._save_conversation_state()
+
+        # Leave the session clean so a later hand-off back does not fan out
+        # every event to duplicate handlers
+        self._unregister_handlers()
 
     async def on_user_turn_completed(
         self,
@@ -273,8 +571,13 @@ class VoiceAssistantAgent(Agent):
         Called when the user's turn has ended, before the agent's reply.
         This is where we can modify the user's message or add context before processing.
         """
+        # Pure filler ("uh", "um", "hmm") is not a request; skip the LLM
+        # and TTS round-trip entirely
+        if _FILLER_RE.match(new_message.text_content or ""):
+            raise StopResponse()
+
         # Add the message to our conversation history
-        self.conversation_history.append(
+        self._append_history(
             LLMMessage(role="user", content=new_message.text_content)
         )
         
@@ -283,11 +586,21 @@ class VoiceAssistantAgent(Agent):
 
         # new_message.content = filter_offensive_content(new_message.content)
         
-        # Add any relevant context from our backend
+        # Add any relevant context from our backend. The lookup only gets a
+        # short budget so it does not hold up the reply; a late result belongs
+        # to this query, not the next one, so it is dropped.
         if self.backend_client:
-            context = await self.backend_client.get_relevant_context(
-                new_message.text_content
-            )
+            try:
+                context = await asyncio.wait_for(
+                    self.backend_client.get_relevant_context(
+                        new_message.text_content,
+                        conversation_id=self.conversation_id
+                    ),
+                    timeout=_CONTEXT_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                context = None
+
             if context:
                 turn_ctx.add_message(
                     role="assistant",
@@ -297,20 +610,37 @@ class VoiceAssistantAgent(Agent):
     async def _handle_transcription(self, event: "UserInputTranscribedEvent") -> None:
         """Handle STT transcription events."""
         if not event.is_final:
-            # Update metrics with attributes
-            attributes = {
-                **self.metrics.attributes,
-                "conversation_id": self.conversation_id,
-                "language": event.language,
-                "speaker_id": event.speaker_id,
-                "is_final": str(event.is_final)
-            }
+            # Interim results fire many times per second; reuse the merged
+            # attribute set for this speaker instead of rebuilding it.
+            key = (self.conversation_id, event.language, event.speaker_id)
+            attributes = self._interim_attrs_cache.get(key)
+            if attributes is None:
+                attributes = self._interim_attrs_cache.setdefault(key, dict(
+                    self._base_attributes,
+                    conversation_id=self.conversation_id,
+                    language=event.language,
+                    speaker_id=event.speaker_id,
+                    is_final="False"
+                ))
             self.metrics.stt_interim_results.add(1, attributes)
             return
 
         if not self.conversation_id:
             return
 
+        attributes = dict(
+            self._base_attributes,
+            conversation_id=self.conversation_id,
+            language=event.language,
+            speaker_id=event.speaker_id,
+            is_final="True"
+        )
+
+        if event.speaker_id:
+            participant = self._touch_participant(event.speaker_id)
+            participant.language = event.language
+            participant.final_transcripts += 1
+
         # Update metrics for final transcription
         self.metrics.stt_final_results.add(1, attributes)
         
@@ -321,64 +651,58 @@ class VoiceAssistantAgent(Agent):
             self.metrics.stt_confidence.record(event.confidence, attributes)
 
         # Store transcription in database
-        asyncio.create_task(
-            self.backend_client.store_transcription(
-                conversation_id=self.conversation_id,
-                text=event.transcript,
-                metadata={
-                    "language": event.language,
-                    "speaker_id": event.speaker_id,
-                    "is_final": event.is_final,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-            )
-        )
+        self._enqueue_write("transcriptions", {
+            "text": event.transcript,
+            "metadata": {
+                "language": event.language,
+                "speaker_id": event.speaker_id,
+                "is_final": event.is_final
+            }
+        })
 
     async def _handle_conversation_item(self, event: "ConversationItemAddedEvent") -> None:
         """Handle conversation updates for both user and agent messages."""
         if not self.conversation_id:
             return
 
-        # Store message in conversation history
-        self.conversation_history.append(
-            LLMMessage(role=event.item.role, content=event.item.text_content)
-        )
+        # Store message in conversation history; user turns are already added
+        # in on_user_turn_completed, so only other roles are appended here
+        if event.item.role != "user":
+            self._append_history(
+                LLMMessage(role=event.item.role, content=event.item.text_content)
+            )
 
         # For LLM responses, store additional metadata and update metrics
         if event.item.role == "assistant":
             # Get token counts for metrics
-            total_tokens = len(event.item.text_content.split())
+            total_tokens = _approx_tokens(event.item.text_content)
             
             # Update metrics with attributes
-            attributes = {
-                **self.metrics.attributes,
-                "conversation_id": self.conversation_id,
-                "interrupted": str(event.item.interrupted)
-            }
+            attributes = dict(
+                self._base_attributes,
+                conversation_id=self.conversation_id,
+                interrupted=str(event.item.interrupted)
+            )
             
             self.metrics.llm_tokens.add(total_tokens, attributes)
             if hasattr(event.item, "latency"):
                 self.metrics.llm_latency.record(event.item.latency, attributes)
             if hasattr(event.item, "prompt"):
                 self.metrics.llm_response_tokens.record(
-                    len(event.item.prompt.split()),
+                    _approx_tokens(event.item.prompt),
                     attributes
                 )
             
             # Store in backend
-            asyncio.create_task(
-                self.backend_client.store_llm_response(
-                    conversation_id=self.conversation_id,
-                    prompt=event.item.prompt if hasattr(event.item, "prompt") else "",
-                    response=event.item.text_content,
-                    metadata={
-                        "model": getattr(self.llm_config, "model", "unknown"),
-                        "provider": getattr(self.llm_config, "provider", ProviderType.UNKNOWN).value,
-                        "interrupted": event.item.interrupted,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                )
-            )
+            self._enqueue_write("llm_turns", {
+                "prompt": event.item.prompt if hasattr(event.item, "prompt") else "",
+                "response": event.item.text_content,
+                "metadata": {
+                    "model": self._llm_model_str,
+                    "provider": self._llm_provider_str,
+                    "interrupted": event.item.interrupted
+                }
+            })
 
     async def _handle_speech_created(self, event: "SpeechCreatedEvent") -> None:
         """Handle TTS speech generation events."""
@@ -387,12 +711,12 @@ class VoiceAssistantAgent(Agent):
 
         # Update metrics with attributes
         text = event.speech_handle.text if hasattr(event.speech_handle, "text") else ""
-        attributes = {
-            **self.metrics.attributes,
-            "conversation_id": self.conversation_id,
-            "source": event.source,
-            "user_initiated": str(event.user_initiated)
-        }
+        attributes = dict(
+            self._base_attributes,
+            conversation_id=self.conversation_id,
+            source=event.source,
+            user_initiated=str(event.user_initiated)
+        )
 
         # Record TTS metrics
         self.metrics.tts_requests.add(1, attributes)
@@ -408,31 +732,23 @@ class VoiceAssistantAgent(Agent):
             )
 
         # Store TTS metadata
-        asyncio.create_task(
-            self.backend_client.store_tts_metadata(
-                conversation_id=self.conversation_id,
-                text=text,
-                metadata={
-                    "source": event.source,
-                    "user_initiated": event.user_initiated,
-                    "model": getattr(self.tts_config, "model", "unknown"),
-                    "provider": getattr(self.tts_config, "provider", ProviderType.UNKNOWN).value,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-            )
-        )
+        self._enqueue_write("tts_events", {
+            "text": text,
+            "metadata": {
+                "source": event.source,
+                "user_initiated": event.user_initiated,
+                "model": self._tts_model_str,
+                "provider": self._tts_provider_str
+            }
+        })
 
     async def _handle_agent_state(self, event: "AgentStateChangedEvent") -> None:
         """Handle agent state changes."""
-        logger.info(f"Agent state changed: {event.old_state} -> {event.new_state}")
-        
-        # Update session duration metric
-        session_duration = (datetime.utcnow() - self.session_start).total_seconds()
-        self.metrics.session_duration.set(session_duration)
+        logger.info("Agent state changed: %s -> %s", event.old_state, event.new_state)
 
     async def _handle_user_state(self, event: "UserStateChangedEvent") -> None:
         """Handle user state changes."""
-        logger.info(f"User state changed: {event.old_state} -> {event.new_state}")
+        logger.info("User state changed: %s -> %s", event.old_state, event.new_state)
         
         # Handle user going away
         if event.new_state == "away":
@@ -443,18 +759,20 @@ class VoiceAssistantAgent(Agent):
     async def _handle_error(self, event: "ErrorEvent") -> None:
         """Handle errors during the session."""
         logger.error(
-            f"Error in {event.source}: {event.error}",
+            "Error in %s: %s",
+            event.source,
+            event.error,
             extra={"recoverable": event.error.recoverable}
         )
         
         # Update error metrics with attributes
-        attributes = {
-            **self.metrics.attributes,
-            "conversation_id": self.conversation_id,
-            "source": str(event.source),
-            "recoverable": str(event.error.recoverable),
-            "error_type": event.error.__class__.__name__
-        }
+        attributes = dict(
+            self._base_attributes,
+            conversation_id=self.conversation_id,
+            source=str(event.source),
+            recoverable=str(event.error.recoverable),
+            error_type=event.error.__class__.__name__
+        )
         self.metrics.errors.add(1, attributes)
 
         if not event.error.recoverable:
@@ -476,21 +794,124 @@ class VoiceAssistantAgent(Agent):
     async def cleanup(self):
         """Clean up resources and save final session state."""
         logger.info("Cleaning up voice assistant agent")
+        _active_agents.discard(self)
         
-        if self.conversation_id and self.backend_client:
-            # Save final conversation state
-            await self.backend_client.save_conversation_state(
-                conversation_id=self.conversation_id,
-                messages=self.conversation_history
-            )
+        # Stop the periodic flusher and send whatever is still queued
+        if self._flusher_task:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
         
-        # Clean up backend client
         if self.backend_client:
-            await self.backend_client.cleanup()
+            # Queued events and the final conversation state are independent
+            # requests, so send them concurrently. The backend client itself is
+            # owned by the job process and outlives this agent.
+            pending = [self._flush_writes()]
+            if self.conversation_id:
+                pending.append(self._save_conversation_state())
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.error("Error saving session state during cleanup: %s", result)
         
         logger.info("Cleanup complete")
 
 
+def _get_provider_type(provider_string: str) -> ProviderType:
+    """Safely convert provider string to ProviderType enum."""
+    provider = _PROVIDER_LOOKUP.get(provider_string.upper() if provider_string else "")
+    if provider is None:
+        logger.warning("Invalid provider type: %s, falling back to OPENAI", provider_string)
+        return ProviderType.OPENAI
+    return provider
+
+
+def _build_provider_configs(settings: Settings) -> Tuple[STTConfig, LLMConfig, TTSConfig]:
+    """Create the STT/LLM/TTS provider configs described by the settings."""
+    # Provider API keys are resolved on demand for the selected providers only
+    secrets = get_provider_secrets()
+    stt_provider = _get_provider_type(settings.stt_provider)
+    llm_provider = _get_provider_type(settings.llm_provider)
+    tts_provider = _get_provider_type(settings.tts_provider)
+
+    stt_config = STTConfig(
+        provider=stt_provider,
+        model=settings.stt_model,
+        language=settings.stt_language,
+        metadata=_provider_metadata(stt_provider, secrets)
+    )
+    
+    llm_config = LLMConfig(
+        provider=llm_provider,
+        model=settings.llm_model,
+        temperature=settings.llm_temperature,
+        max_tokens=settings.llm_max_tokens,
+        system_prompt=settings.llm_system_prompt,
+        metadata=_provider_metadata(llm_provider, secrets)
+    )
+    
+    tts_config = TTSConfig(
+        provider=tts_provider,
+        voice=settings.tts_voice,
+        model=settings.tts_model,
+        metadata=_provider_metadata(tts_provider, secrets)
+    )
+    return stt_config, llm_config, tts_config
+
+
+def _create_provider_plugins(
+    stt_config: STTConfig,
+    llm_config: LLMConfig,
+    tts_config: TTSConfig
+) -> Tuple[Any, Any, Any]:
+    """
+    Create LiveKit plugin instances from configs.
+
+    These are the actual plugins that AgentSession uses for STT/LLM/TTS
+    processing; LiveKit handles all audio streaming, buffering, and
+    processing automatically.
+    """
+    return (
+        ProviderFactory.create_stt(stt_config),
+        ProviderFactory.create_llm(llm_config),
+        ProviderFactory.create_tts(tts_config)
+    )
+
+
+async def _close_on_process_shutdown(backend_client: BackendClient) -> None:
+    """
+    Close the process-shared backend client when the job process shuts down.
+
+    JobProcess has no shutdown callback of its own, so this task idles until
+    the process's event loop cancels it on exit, then flushes and closes the
+    client.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await backend_client.cleanup()
+
+
+def prewarm(proc: JobProcess) -> None:
+    """
+    Prepare per-process resources shared by every job this process runs.
+
+    The backend client keeps one pooled HTTP session, so connections (and
+    TLS handshakes) are reused across jobs instead of per session. Provider
+    plugins are built once here so new rooms skip their setup cost; they
+    hold no per-conversation state. The VAD model is loaded here too, since
+    loading it takes far longer than a room can wait.
+    """
+    settings = get_settings()
+    proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["backend_client"] = BackendClient(settings)
+    provider_configs = _build_provider_configs(settings)
+    proc.userdata["provider_configs"] = provider_configs
+    proc.userdata["provider_plugins"] = _create_provider_plugins(*provider_configs)
+
+
 async def entrypoint(ctx: JobContext):
     """
     Entry point for the LiveKit agent job.
@@ -505,52 +926,37 @@ async def entrypoint(ctx: JobContext):
     
     logger.info("Initializing agent job", extra=ctx.log_context_fields)
     
-    # Load settings and create backend client
-    settings = Settings()
-    backend_client = BackendClient(settings)
+    # Load settings (cached per process) and reuse the process backend client
+    settings = get_settings()
+    backend_client = ctx.proc.userdata.get("backend_client")
+    owns_backend_client = backend_client is None
+    if owns_backend_client:
+        backend_client = BackendClient(settings)
+    elif "backend_client_closer" not in ctx.proc.userdata:
+        ctx.proc.userdata["backend_client_closer"] = asyncio.create_task(
+            _close_on_process_shutdown(backend_client)
+        )
     
     # Load job metadata if provided
     if ctx.job.metadata:
         try:
-            metadata = json.loads(ctx.job.metadata)
-            logger.info(f"Job metadata loaded: {metadata}", extra=ctx.log_context_fields)
-        except json.JSONDecodeError:
+            metadata = _parse_metadata(ctx.job.metadata)
+            logger.info("Job metadata loaded: %s", metadata, extra=ctx.log_context_fields)
+        except orjson.JSONDecodeError:
             logger.warning("Failed to parse job metadata", extra=ctx.log_context_fields)
             metadata = {}
     else:
         metadata = {}
     
-    # Create provider configs
-    def get_provider_type(provider_string: str) -> ProviderType:
-        """Safely convert provider string to ProviderType enum."""
-        try:
-            return ProviderType[provider_string.upper()]
-        except (KeyError, AttributeError):
-            logger.warning(f"Invalid provider type: {provider_string}, falling back to OPENAI")
-            return ProviderType.OPENAI
-
-    stt_config = STTConfig(
-        provider=get_provider_type(settings.stt_provider),
-        model=settings.stt_model,
-        language=settings.stt_language,
-        metadata={"api_key": settings.openai_api_key}
-    )
-    
-    llm_config = LLMConfig(
-        provider=get_provider_type(settings.llm_provider),
-        model=settings.llm_model,
-        temperature=settings.llm_temperature,
-        max_tokens=settings.llm_max_tokens,
-        system_prompt=settings.llm_system_prompt,
-        metadata={"api_key": settings.openai_api_key}
-    )
-    
-    tts_config = TTSConfig(
-        provider=get_provider_type(settings.tts_provider),
-        voice=settings.tts_voice,
-        model=settings.tts_model,
-        metadata={"api_key": settings.openai_api_key}
-    )
+    # Provider configs and plugins are normally built once in prewarm()
+    provider_configs = ctx.proc.userdata.get("provider_configs")
+    provider_plugins = ctx.proc.userdata.get("provider_plugins")
+    if provider_configs is None or provider_plugins is None:
+        provider_configs = _build_provider_configs(settings)
+        provider_plugins = _create_provider_plugins(*provider_configs)
+    stt_config, llm_config, tts_config = provider_configs
+    stt_plugin, llm_plugin, tts_plugin = provider_plugins
+    vad = ctx.proc.userdata.get("vad") or silero.VAD.load()
     
     # Create agent instance
     agent = VoiceAssistantAgent(
@@ -558,21 +964,22 @@ async def entrypoint(ctx: JobContext):
         backend_client=backend_client,
         stt_config=stt_config,  # Passed for metrics/observability only
         llm_config=llm_config,  # Passed for metrics/observability only
-        tts_config=tts_config   # Passed for metrics/observability only
+        tts_config=tts_config,  # Passed for metrics/observability only
+        # Static instructions form the cacheable prompt prefix; per-turn
+        # context is appended to the chat context instead
+        instructions=llm_config.system_prompt or settings.llm_system_prompt
     )
     
-    # Create LiveKit plugin instances from configs
-    # These are the actual plugins that AgentSession uses for STT/LLM/TTS processing
-    # LiveKit handles all audio streaming, buffering, and processing automatically
-    stt_plugin = ProviderFactory.create_stt(stt_config)
-    llm_plugin = ProviderFactory.create_llm(llm_config)
-    tts_plugin = ProviderFactory.create_tts(tts_config)
-    
     # Register shutdown hook for cleanup
     async def cleanup_hook():
         logger.info("Running cleanup hook", extra=ctx.log_context_fields)
         await agent.cleanup()
-        await backend_client.cleanup()
+        if owns_backend_client:
+            await backend_client.cleanup()
+        else:
+            # A shared client stays open for the next job in this process, but
+            # this job's batched analytics events are sent now
+            await backend_client.flush()
     
     ctx.add_shutdown_callback(cleanup_hook)
     
@@ -584,7 +991,8 @@ async def entrypoint(ctx: JobContext):
         # Wait for first participant
         participant = await ctx.wait_for_participant()
         logger.info(
-            f"First participant joined: {participant.identity}",
+            "First participant joined: %s",
+            participant.identity,
             extra=ctx.log_context_fields
         )
         
@@ -604,7 +1012,13 @@ async def entrypoint(ctx: JobContext):
         session = AgentSession(
             stt=stt_plugin,
             llm=llm_plugin,
-            tts=tts_plugin
+            tts=tts_plugin,
+            # Only detected speech reaches STT; silence is never transcribed
+            # and non-streaming STT gets natural utterance boundaries
+            vad=vad,
+            # Start the LLM on the transcript while end of turn is still being
+            # confirmed; the draft is discarded if the user keeps speaking
+            preemptive_generation=settings.preemptive_generation
         )
         
         await session.start(
@@ -619,7 +1033,7 @@ async def entrypoint(ctx: JobContext):
         await ctx.wait_for_disconnection()
         
     except Exception as e:
-        logger.error(f"Error in agent job: {str(e)}", exc_info=True, extra=ctx.log_context_fields)
+        logger.error("Error in agent job: %s", e, exc_info=True, extra=ctx.log_context_fields)
         # Ensure proper cleanup on error
         ctx.shutdown(reason=f"Error occurred: {str(e)}")
     finally:
@@ -631,5 +1045,6 @@ if __name__ == "__main__":
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
+            prewarm_fnc=prewarm,
         )
     )
@@ -167,17 +167,18 @@ def example_custom_vendor_adapter():
             form_data.add_field('language', self.language)
             form_data.add_field('model', 'my-vendor-model-v2')
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.endpoint_url,
-                    data=form_data,
-                    headers={'Authorization': f'Bearer {self.api_key}'}
-                ) as response:
-                    response.raise_for_status()
-                    result = await response.json()
-                    
-                    # MyVendor returns: {"result": {"transcript": "..."}}
-                    return result.get("result", {}).get("transcript", "")
+            # Reuse the adapter's pooled session
+            session = await self._get_session()
+            async with session.post(
+                self.endpoint_url,
+                data=form_data,
+                headers={'Authorization': f'Bearer {self.api_key}'}
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
+                
+                # MyVendor returns: {"result": {"transcript": "..."}}
+                return result.get("result", {}).get("transcript", "")
     
     # Use the custom adapter
     config = STTConfig(
@@ -201,7 +202,7 @@ def example_custom_vendor_adapter():
 In your agent.py entrypoint function, use custom providers like this:
 
 async def entrypoint(ctx: JobContext):
-    settings = Settings()
+    settings = get_settings()
     
     # Option 1: Use environment variables to configure
     if settings.stt_provider == "deepgram":
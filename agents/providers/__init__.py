@@ -7,28 +7,64 @@ passed directly to AgentSession. LiveKit handles all audio streaming and bufferi
 Supports both native LiveKit plugins and custom HTTP/WebSocket endpoints.
 """
 
+import importlib
+from typing import Any, Callable
+
 from .base import ProviderFactory, ProviderType
-from .openai_provider import OpenAIProviderFactory
-from .azure_provider import AzureProviderFactory
-from .custom_provider import CustomProviderFactory
+
+
+# Provider factory classes are imported on first use so that importing this
+# package does not load plugin SDKs for providers the worker never selects.
+_LAZY_EXPORTS = {
+    'OpenAIProviderFactory': '.openai_provider',
+    'AzureProviderFactory': '.azure_provider',
+    'CustomProviderFactory': '.custom_provider',
+}
+
+_REGISTERED = False
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def _lazy_factory(class_name: str, method_name: str) -> Callable[[Any], Any]:
+    """Return a factory function that imports its provider module when called."""
+    def factory(config: Any) -> Any:
+        return getattr(__getattr__(class_name), method_name)(config)
+    return factory
 
 
 def register_all_providers():
-    """Register all available providers with the factory."""
-    
-    # Register OpenAI providers (using class methods)
-    ProviderFactory.register_stt_provider(ProviderType.OPENAI, OpenAIProviderFactory.create_stt)
-    ProviderFactory.register_llm_provider(ProviderType.OPENAI, OpenAIProviderFactory.create_llm)
-    ProviderFactory.register_tts_provider(ProviderType.OPENAI, OpenAIProviderFactory.create_tts)
+    """Register all available providers with the factory. Safe to call repeatedly."""
+    global _REGISTERED
+    if _REGISTERED:
+        return
     
-    # Register Azure OpenAI providers (using class methods)
-    ProviderFactory.register_stt_provider(ProviderType.AZURE, AzureProviderFactory.create_stt)
-    ProviderFactory.register_llm_provider(ProviderType.AZURE, AzureProviderFactory.create_llm)
-    ProviderFactory.register_tts_provider(ProviderType.AZURE, AzureProviderFactory.create_tts)
+    ProviderFactory.register_many(
+        stt={
+            ProviderType.OPENAI: _lazy_factory('OpenAIProviderFactory', 'create_stt'),
+            ProviderType.AZURE: _lazy_factory('AzureProviderFactory', 'create_stt'),
+            # Custom HTTP/WebSocket endpoints
+            ProviderType.CUSTOM_HTTP: _lazy_factory('CustomProviderFactory', 'create_http_stt'),
+            ProviderType.CUSTOM_WS: _lazy_factory('CustomProviderFactory', 'create_websocket_stt'),
+        },
+        llm={
+            ProviderType.OPENAI: _lazy_factory('OpenAIProviderFactory', 'create_llm'),
+            ProviderType.AZURE: _lazy_factory('AzureProviderFactory', 'create_llm'),
+        },
+        tts={
+            ProviderType.OPENAI: _lazy_factory('OpenAIProviderFactory', 'create_tts'),
+            ProviderType.AZURE: _lazy_factory('AzureProviderFactory', 'create_tts'),
+        },
+    )
     
-    # Register custom HTTP/WebSocket providers
-    ProviderFactory.register_stt_provider(ProviderType.CUSTOM_HTTP, CustomProviderFactory.create_http_stt)
-    ProviderFactory.register_stt_provider(ProviderType.CUSTOM_WS, CustomProviderFactory.create_websocket_stt)
+    _REGISTERED = True
 
 
 # Auto-register on import
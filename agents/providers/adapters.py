@@ -5,15 +5,62 @@ This allows seamless integration of third-party STT/LLM/TTS services that don't
 have LiveKit plugins, by providing a unified interface.
 """
 
-from typing import AsyncIterator, Optional, Any
+from typing import AsyncIterator, Optional, Any, Union
 import aiohttp
 import asyncio
 import logging
+import socket
+import struct
 
+import orjson
+from multidict import CIMultiDict, CIMultiDictProxy
+from livekit import rtc
 from livekit.agents import stt, llm, tts
 
 logger = logging.getLogger(__name__)
 
+# Outgoing audio frames buffered per stream (~500 ms of 20 ms frames); when the
+# server falls behind, the oldest audio is dropped to keep latency bounded
+_SEND_QUEUE_MAXSIZE = 25
+
+# PCM audio does not compress, so permessage-deflate is never negotiated;
+# pings keep idle streams alive through proxies
+_WS_HEARTBEAT = 20.0
+
+
+# Resolved addresses are cached per connector for this many seconds
+_DNS_CACHE_TTL = 300
+
+
+def _make_resolver() -> aiohttp.abc.AbstractResolver:
+    """Use the c-ares based resolver when aiodns is installed, else aiohttp's threaded one."""
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError:
+        return aiohttp.ThreadedResolver()
+
+
+def _parse_messages(raw: Union[str, bytes]) -> list:
+    """Decode a TEXT frame that holds one JSON message or a batched array of them."""
+    data = orjson.loads(raw)
+    return data if isinstance(data, list) else [data]
+
+
+def _wrap_wav(pcm: Union[bytes, memoryview], sample_rate: int) -> bytes:
+    """Prepend a 44-byte RIFF/WAVE header to mono 16-bit PCM."""
+    size = len(pcm)
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", size,
+    )
+    return b"".join((header, pcm))
+
+
+# Control message closing the upstream audio; constant, so encoded once
+_END_OF_STREAM = orjson.dumps({"type": "end_of_stream"}).decode()
+
 
 class STTAdapter(stt.STT):
     """
@@ -32,11 +79,46 @@ class STTAdapter(stt.STT):
             )
         )
         self._sample_rate = sample_rate
+        # Failed requests/streams since creation, for health checks and metrics
+        self.error_count = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
     
     @property
     def sample_rate(self) -> int:
         """Audio sample rate expected by this STT."""
         return self._sample_rate
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the adapter's pooled HTTP session, creating it on first use.
+        
+        Reusing one session keeps TCP/TLS connections alive between requests
+        instead of paying a new handshake per transcription.
+        """
+        if self._session is None or self._session.closed:
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    self._session = aiohttp.ClientSession(
+                        connector=aiohttp.TCPConnector(
+                            resolver=_make_resolver(),
+                            family=socket.AF_UNSPEC,
+                            happy_eyeballs_delay=0.25,
+                            ttl_dns_cache=_DNS_CACHE_TTL,
+                            limit=100,
+                            limit_per_host=100,
+                            keepalive_timeout=60,
+                            enable_cleanup_closed=True
+                        )
+                    )
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        await super().aclose()
 
 
 class LiveKitSTTAdapter(STTAdapter):
@@ -71,11 +153,19 @@ class LiveKitSTTAdapter(STTAdapter):
     async def transcribe(self, audio_data: bytes) -> str:
         """Pass through to LiveKit plugin's transcription."""
         return await self.plugin.transcribe(audio_data)
+    
+    async def aclose(self) -> None:
+        """Close the wrapped plugin; this adapter holds no session of its own."""
+        await self.plugin.aclose()
 
 
 class CustomHTTPSTTAdapter(STTAdapter):
     """Adapter for custom HTTP-based STT endpoints."""
     
+    # Constants rather than properties: they are read for every speech event
+    model = "custom-http"
+    provider = "custom"
+    
     def __init__(
         self,
         endpoint_url: str,
@@ -83,7 +173,9 @@ class CustomHTTPSTTAdapter(STTAdapter):
         language: str = "en-US",
         headers: Optional[dict] = None,
         request_timeout: int = 30,
-        sample_rate: int = 16000
+        sample_rate: int = 16000,
+        connect_timeout: float = 2.0,
+        audio_format: str = "pcm"
     ):
         """
         Initialize custom HTTP STT adapter.
@@ -93,8 +185,10 @@ class CustomHTTPSTTAdapter(STTAdapter):
             api_key: Optional API key for authentication
             language: Language code for transcription
             headers: Additional HTTP headers
-            request_timeout: Request timeout in seconds
+            request_timeout: Max seconds between reads of the response
             sample_rate: Audio sample rate
+            connect_timeout: Max seconds to obtain and establish a connection
+            audio_format: "pcm" for raw LINEAR16 or "wav" for WAV-framed audio
         """
         super().__init__(sample_rate=sample_rate, streaming=False, interim_results=False)
         
@@ -102,22 +196,22 @@ class CustomHTTPSTTAdapter(STTAdapter):
         self.api_key = api_key
         self.language = language
         self.request_timeout = request_timeout
+        self.audio_format = audio_format
+        # Fail fast on connection problems, but let a slow transcription run
+        # as long as the response keeps progressing
+        self._timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=connect_timeout,
+            sock_connect=connect_timeout,
+            sock_read=request_timeout
+        )
         
-        # Build headers
+        # Build headers; the multipart body sets its own Content-Type
         self.headers = headers or {}
         if api_key:
             self.headers["Authorization"] = f"Bearer {api_key}"
-        self.headers["Content-Type"] = "audio/wav"
-    
-    @property
-    def model(self) -> str:
-        """Model identifier."""
-        return "custom-http"
-    
-    @property
-    def provider(self) -> str:
-        """Provider name."""
-        return "custom"
+        # Normalized once so aiohttp does not rebuild the mapping per request
+        self._headers = CIMultiDictProxy(CIMultiDict(self.headers))
     
     async def _recognize_impl(
         self,
@@ -138,8 +232,8 @@ class CustomHTTPSTTAdapter(STTAdapter):
             SpeechEvent with transcription
         """
         try:
-            # Convert AudioBuffer to bytes
-            audio_data = buffer.data.tobytes()
+            # View the AudioBuffer as bytes without copying it
+            audio_data = memoryview(buffer.data).cast("B")
             
             # Send to custom endpoint
             text = await self._send_audio_chunk(audio_data)
@@ -151,56 +245,71 @@ class CustomHTTPSTTAdapter(STTAdapter):
             )
                     
         except asyncio.TimeoutError:
-            logger.error(f"Timeout calling STT endpoint: {self.endpoint_url}")
+            self.error_count += 1
+            logger.error("Timeout calling STT endpoint: %s", self.endpoint_url)
             return stt.SpeechEvent(
                 type=stt.SpeechEventType.FINAL_TRANSCRIPT,
                 alternatives=[stt.SpeechData(text="", language=language or self.language)]
             )
         except Exception as e:
-            logger.error(f"Error in STT transcription: {e}", exc_info=True)
+            self.error_count += 1
+            logger.error("Error in STT transcription: %s", e, exc_info=True)
             return stt.SpeechEvent(
                 type=stt.SpeechEventType.FINAL_TRANSCRIPT,
                 alternatives=[stt.SpeechData(text="", language=language or self.language)]
             )
     
-    async def _send_audio_chunk(self, audio_data: bytes) -> str:
+    async def _send_audio_chunk(self, audio_data: Union[bytes, memoryview]) -> str:
         """
         Send audio chunk to custom endpoint.
         
         Override this method to customize the request format for your specific endpoint.
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                # Build request payload
-                # Adjust this based on your endpoint's expected format
-                data = {
-                    "audio": audio_data,
-                    "language": self.language,
-                    "encoding": "LINEAR16",
-                    "sample_rate": 16000
-                }
+            session = await self._get_session()
+            
+            if self.audio_format == "wav":
+                # Copying a long utterance into the WAV body stays off the event loop
+                audio_data = await asyncio.get_running_loop().run_in_executor(
+                    None, _wrap_wav, audio_data, self.sample_rate
+                )
+                content_type = "audio/wav"
+            else:
+                content_type = f"audio/l16; rate={self.sample_rate}"
+            filename = f"audio.{self.audio_format}"
+            
+            # Build request payload: audio as a binary multipart part, with
+            # format details as query parameters (no JSON/base64 encoding)
+            # Adjust this based on your endpoint's expected format
+            data = aiohttp.FormData()
+            data.add_field("audio", audio_data, filename=filename, content_type=content_type)
+            data.add_field("language", self.language)
+            
+            async with session.post(
+                self.endpoint_url,
+                data=data,
+                params={"encoding": "LINEAR16", "sample_rate": str(self.sample_rate)},
+                headers=self._headers,
+                timeout=self._timeout
+            ) as response:
+                response.raise_for_status()
+                result = await response.json(loads=orjson.loads)
                 
-                async with session.post(
-                    self.endpoint_url,
-                    json=data,
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=self.request_timeout)
-                ) as response:
-                    response.raise_for_status()
-                    result = await response.json()
-                    
-                    # Extract transcription from response
-                    # Adjust this based on your endpoint's response format
-                    return result.get("transcription", result.get("text", ""))
+                # Extract transcription from response
+                # Adjust this based on your endpoint's response format
+                return result.get("transcription", result.get("text", ""))
                     
         except asyncio.TimeoutError:
-            logger.error(f"Timeout calling STT endpoint: {self.endpoint_url}")
+            self.error_count += 1
+            logger.error("Timeout calling STT endpoint: %s", self.endpoint_url)
             return ""
         except aiohttp.ClientError as e:
-            logger.error(f"Error calling STT endpoint: {e}")
+            self.error_count += 1
+            logger.error("Error calling STT endpoint: %s", e)
             return ""
         except Exception as e:
-            logger.error(f"Unexpected error in STT transcription: {e}", exc_info=True)
+            self.error_count += 1
+            logger.error("Unexpected error in STT transcription: %s", e, exc_info=True)
             return ""
 
 
@@ -211,6 +320,9 @@ class CustomWebSocketSTTAdapter(STTAdapter):
     Use this for true real-time streaming STT services.
     """
     
+    model = "custom-websocket"
+    provider = "custom"
+    
     def __init__(
         self,
         ws_url: str,
@@ -232,16 +344,24 @@ class CustomWebSocketSTTAdapter(STTAdapter):
         self.ws_url = ws_url
         self.api_key = api_key
         self.language = language
+        # The config message only depends on constructor arguments, so it is
+        # encoded once instead of on every (re)connect
+        self._config_frame = self._encode_config(language)
     
-    @property
-    def model(self) -> str:
-        """Model identifier."""
-        return "custom-websocket"
+    def _encode_config(self, language: str) -> str:
+        return orjson.dumps({
+            "type": "config",
+            "language": language,
+            "sample_rate": self.sample_rate,
+            "encoding": "LINEAR16",
+            "batch_updates": True
+        }).decode()
     
-    @property
-    def provider(self) -> str:
-        """Provider name."""
-        return "custom"
+    def config_frame(self, language: str) -> str:
+        """Encoded config message for a stream in the given language."""
+        if language == self.language:
+            return self._config_frame
+        return self._encode_config(language)
     
     async def _recognize_impl(
         self,
@@ -254,15 +374,15 @@ class CustomWebSocketSTTAdapter(STTAdapter):
         For WebSocket, use stream() method instead.
         This provides a fallback for non-streaming use.
         """
-        # Convert to streaming
-        audio_data = buffer.data.tobytes()
-        
-        result = []
-        async for event in self._transcribe_stream(audio_data):
-            if event.type == stt.SpeechEventType.FINAL_TRANSCRIPT:
-                result.append(event.alternatives[0].text)
+        # Convert to streaming; the byte view avoids copying the buffer
+        audio_data = memoryview(buffer.data).cast("B")
         
-        final_text = " ".join(result)
+        # Only final segments matter here, so interim messages are dropped
+        # before any event objects are built for them
+        final_text = " ".join([
+            event.alternatives[0].text
+            async for event in self._transcribe_stream(audio_data, finals_only=True)
+        ])
         return stt.SpeechEvent(
             type=stt.SpeechEventType.FINAL_TRANSCRIPT,
             alternatives=[stt.SpeechData(text=final_text, language=language or self.language)]
@@ -276,58 +396,69 @@ class CustomWebSocketSTTAdapter(STTAdapter):
     ) -> "WebSocketSpeechStream":
         """Create a streaming session."""
         return WebSocketSpeechStream(
-            stt=self,
+            adapter=self,
             language=language or self.language,
             conn_options=conn_options or stt.APIConnectOptions()
         )
     
-    async def _transcribe_stream(self, audio_data: bytes) -> AsyncIterator[stt.SpeechEvent]:
-        """Internal method for streaming transcription."""
-        async with aiohttp.ClientSession() as session:
-            headers = {}
-            if self.api_key:
-                headers["Authorization"] = f"Bearer {self.api_key}"
-            
-            try:
-                async with session.ws_connect(self.ws_url, headers=headers) as ws:
-                    # Send initial configuration
-                    await ws.send_json({
-                        "type": "config",
-                        "language": self.language,
-                        "sample_rate": self.sample_rate,
-                        "encoding": "LINEAR16"
-                    })
-                    
-                    # Send audio data
-                    await ws.send_bytes(audio_data)
-                    await ws.send_json({"type": "end_of_stream"})
-                    
-                    # Receive transcriptions
-                    async for msg in ws:
-                        if msg.type == aiohttp.WSMsgType.TEXT:
-                            data = msg.json()
+    async def _transcribe_stream(
+        self,
+        audio_data: Union[bytes, memoryview],
+        *,
+        finals_only: bool = False
+    ) -> AsyncIterator[stt.SpeechEvent]:
+        """
+        Internal method for streaming transcription.
+        
+        With finals_only, interim transcripts are skipped and only
+        FINAL_TRANSCRIPT events are yielded.
+        """
+        session = await self._get_session()
+        headers = {}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        
+        try:
+            async with session.ws_connect(
+                self.ws_url, headers=headers, compress=0, heartbeat=_WS_HEARTBEAT
+            ) as ws:
+                # Send initial configuration
+                await ws.send_str(self._config_frame)
+                
+                # Send audio data
+                await ws.send_bytes(audio_data)
+                await ws.send_str(_END_OF_STREAM)
+                
+                # Receive transcriptions
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        for data in _parse_messages(msg.data):
+                            if data.get("type") != "transcription":
+                                continue
+                            is_final = data.get("is_final", False)
+                            if finals_only and not is_final:
+                                continue
+                            text = data.get("text", "")
                             
-                            if data.get("type") == "transcription":
-                                text = data.get("text", "")
-                                is_final = data.get("is_final", False)
-                                
-                                event_type = (
-                                    stt.SpeechEventType.FINAL_TRANSCRIPT
-                                    if is_final
-                                    else stt.SpeechEventType.INTERIM_TRANSCRIPT
-                                )
-                                
-                                yield stt.SpeechEvent(
-                                    type=event_type,
-                                    alternatives=[stt.SpeechData(text=text, language=self.language)]
-                                )
-                        
-                        elif msg.type == aiohttp.WSMsgType.ERROR:
-                            logger.error(f"WebSocket error: {ws.exception()}")
-                            break
+                            event_type = (
+                                stt.SpeechEventType.FINAL_TRANSCRIPT
+                                if is_final
+                                else stt.SpeechEventType.INTERIM_TRANSCRIPT
+                            )
                             
-            except Exception as e:
-                logger.error(f"Error in WebSocket transcription: {e}", exc_info=True)
+                            yield stt.SpeechEvent(
+                                type=event_type,
+                                alternatives=[stt.SpeechData(text=text, language=self.language)]
+                            )
+                    
+                    elif msg.type == aiohttp.WSMsgType.ERROR:
+                        self.error_count += 1
+                        logger.error("WebSocket error: %s", ws.exception())
+                        break
+                        
+        except Exception as e:
+            self.error_count += 1
+            logger.error("Error in WebSocket transcription: %s", e, exc_info=True)
 
 
 class WebSocketSpeechStream(stt.SpeechStream):
@@ -336,75 +467,132 @@ class WebSocketSpeechStream(stt.SpeechStream):
     def __init__(
         self,
         *,
-        stt: CustomWebSocketSTTAdapter,
+        adapter: CustomWebSocketSTTAdapter,
         language: str,
         conn_options: stt.APIConnectOptions
     ):
+        # Named "adapter" so the parameter doesn't shadow the stt module
         super().__init__(
-            stt=stt,
+            stt=adapter,
             conn_options=conn_options,
-            sample_rate=stt.sample_rate
+            sample_rate=adapter.sample_rate
         )
-        self._stt = stt
+        self._stt = adapter
         self._language = language
         self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._send_q: asyncio.Queue = asyncio.Queue(maxsize=_SEND_QUEUE_MAXSIZE)
     
     async def _run(self) -> None:
         """Run the WebSocket streaming session."""
-        self._session = aiohttp.ClientSession()
+        # The handshake goes through the adapter's pooled session
+        session = await self._stt._get_session()
         
         headers = {}
         if self._stt.api_key:
             headers["Authorization"] = f"Bearer {self._stt.api_key}"
         
         try:
-            async with self._session.ws_connect(self._stt.ws_url, headers=headers) as ws:
+            async with session.ws_connect(
+                self._stt.ws_url, headers=headers, compress=0, heartbeat=_WS_HEARTBEAT
+            ) as ws:
                 self._ws = ws
                 
                 # Send configuration
-                await ws.send_json({
-                    "type": "config",
-                    "language": self._language,
-                    "sample_rate": self._stt.sample_rate,
-                    "encoding": "LINEAR16"
-                })
+                await ws.send_str(self._stt.config_frame(self._language))
                 
-                # Handle incoming messages
-                async for msg in ws:
-                    if msg.type == aiohttp.WSMsgType.TEXT:
-                        data = msg.json()
-                        
-                        if data.get("type") == "transcription":
-                            text = data.get("text", "")
-                            is_final = data.get("is_final", False)
-                            
-                            event_type = (
-                                stt.SpeechEventType.FINAL_TRANSCRIPT
-                                if is_final
-                                else stt.SpeechEventType.INTERIM_TRANSCRIPT
-                            )
-                            
-                            event = stt.SpeechEvent(
-                                type=event_type,
-                                alternatives=[stt.SpeechData(text=text, language=self._language)]
-                            )
-                            self._event_ch.send_nowait(event)
-                    
-                    elif msg.type == aiohttp.WSMsgType.ERROR:
-                        logger.error(f"WebSocket error: {ws.exception()}")
-                        break
+                # Upstream audio and downstream transcripts run concurrently;
+                # once the server side closes there is nothing left to send
+                send_tasks = (
+                    asyncio.create_task(self._send_loop()),
+                    asyncio.create_task(self._sender(ws)),
+                )
+                try:
+                    await self._recv_loop(ws)
+                finally:
+                    for task in send_tasks:
+                        task.cancel()
+                    await asyncio.gather(*send_tasks, return_exceptions=True)
                         
         except Exception as e:
-            logger.error(f"Error in WebSocket stream: {e}", exc_info=True)
+            self._stt.error_count += 1
+            logger.error("Error in WebSocket stream: %s", e, exc_info=True)
         finally:
-            if self._session:
-                await self._session.close()
+            self._ws = None
+    
+    async def _send_loop(self) -> None:
+        """Forward pushed audio as fixed 20 ms binary PCM frames."""
+        # 20 ms of mono 16-bit PCM
+        frame_size = self._stt.sample_rate // 50 * 2
+        pending = bytearray()
+        
+        async for data in self._input_ch:
+            if isinstance(data, rtc.AudioFrame):
+                pending += memoryview(data.data).cast("B")
+                if len(pending) < frame_size:
+                    continue
+                end = len(pending) - len(pending) % frame_size
+                for start in range(0, end, frame_size):
+                    self._send_audio_frame(pending[start:start + frame_size])
+                del pending[:end]
+            elif pending:
+                # Flush request: send the partial frame now
+                self._send_audio_frame(pending)
+                pending = bytearray()
+        
+        if pending:
+            self._send_audio_frame(pending)
+        # End-of-input marker for the sender
+        self._send_audio_frame(None)
+    
+    async def _sender(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Write queued audio frames to the socket, then signal end of stream."""
+        while True:
+            data = await self._send_q.get()
+            if data is None:
+                await ws.send_str(_END_OF_STREAM)
+                return
+            await ws.send_bytes(data)
     
-    async def _send_audio_frame(self, frame: stt.AudioFrame) -> None:
-        """Send audio frame to WebSocket."""
-        if self._ws:
-            await self._ws.send_bytes(frame.data.tobytes())
+    async def _recv_loop(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Turn transcription control messages into speech events."""
+        async for msg in ws:
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                # JSON is only used for control/transcript messages; the
+                # server may batch several updates into one array frame
+                for data in _parse_messages(msg.data):
+                    if data.get("type") != "transcription":
+                        continue
+                    text = data.get("text", "")
+                    is_final = data.get("is_final", False)
+                    
+                    event_type = (
+                        stt.SpeechEventType.FINAL_TRANSCRIPT
+                        if is_final
+                        else stt.SpeechEventType.INTERIM_TRANSCRIPT
+                    )
+                    
+                    event = stt.SpeechEvent(
+                        type=event_type,
+                        alternatives=[stt.SpeechData(text=text, language=self._language)]
+                    )
+                    self._event_ch.send_nowait(event)
+            
+            elif msg.type == aiohttp.WSMsgType.BINARY:
+                # Audio only flows upstream; ignore unexpected binary frames
+                continue
+            
+            elif msg.type == aiohttp.WSMsgType.ERROR:
+                self._stt.error_count += 1
+                logger.error("WebSocket error: %s", ws.exception())
+                break
+    
+    def _send_audio_frame(self, data: Optional[bytes]) -> None:
+        """Queue one binary PCM frame for sending, dropping the oldest if full."""
+        try:
+            self._send_q.put_nowait(data)
+        except asyncio.QueueFull:
+            self._send_q.get_nowait()
+            self._send_q.put_nowait(data)
 
 
 # Placeholder adapters for LLM and TTS (can be implemented similarly)
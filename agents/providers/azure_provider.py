@@ -2,8 +2,50 @@
 Azure OpenAI provider factories that return LiveKit plugin instances.
 """
 
+import hashlib
+from typing import Dict, Tuple
+
+import openai
 from livekit.plugins import openai as lk_openai
 from .base import STTConfig, LLMConfig, TTSConfig
+from .openai_provider import get_shared_http_client
+
+
+_DEFAULT_API_VERSION = "2024-02-15-preview"
+
+# One Azure OpenAI client per deployment, shared by every STT/LLM/TTS plugin
+# built for it so sessions reuse its warm connection pool. Keys hold a digest
+# of the API key rather than the key itself.
+_clients: Dict[Tuple[str, str, str, str], openai.AsyncAzureOpenAI] = {}
+
+
+def _get_client(metadata: dict) -> openai.AsyncAzureOpenAI:
+    """Return the shared client for the deployment described by a config's metadata."""
+    endpoint = metadata["azure_endpoint"]
+    deployment = metadata["azure_deployment"]
+    api_version = metadata.get("api_version", _DEFAULT_API_VERSION)
+    # None lets the SDK fall back to the environment or Azure AD auth
+    api_key = metadata.get("api_key")
+    key = (
+        endpoint,
+        deployment,
+        api_version,
+        hashlib.blake2b((api_key or "").encode(), digest_size=16).hexdigest(),
+    )
+    client = _clients.get(key)
+    if client is None:
+        # Same settings the plugins' with_azure() constructors use, on the
+        # process-wide connection pool
+        client = openai.AsyncAzureOpenAI(
+            max_retries=0,
+            azure_endpoint=endpoint,
+            azure_deployment=deployment,
+            api_version=api_version,
+            api_key=api_key,
+            http_client=get_shared_http_client(),
+        )
+        _clients[key] = client
+    return client
 
 
 class AzureProviderFactory:
@@ -12,36 +54,27 @@ class AzureProviderFactory:
     @staticmethod
     def create_stt(config: STTConfig):
         """Create Azure OpenAI STT plugin instance for LiveKit."""
-        return lk_openai.STT.with_azure(
+        return lk_openai.STT(
             model=config.model or "whisper-1",
-            azure_endpoint=config.metadata["azure_endpoint"],
-            azure_deployment=config.metadata["azure_deployment"],
-            api_version=config.metadata.get("api_version", "2024-02-15-preview"),
-            api_key=config.metadata["api_key"]
+            client=_get_client(config.metadata)
         )
     
     @staticmethod
     def create_llm(config: LLMConfig):
         """Create Azure OpenAI LLM plugin instance for LiveKit."""
-        return lk_openai.LLM.with_azure(
+        return lk_openai.LLM(
             model=config.model,
-            azure_endpoint=config.metadata["azure_endpoint"],
-            azure_deployment=config.metadata["azure_deployment"],
-            api_version=config.metadata.get("api_version", "2024-02-15-preview"),
-            api_key=config.metadata["api_key"],
+            client=_get_client(config.metadata),
             temperature=config.temperature
         )
     
     @staticmethod
     def create_tts(config: TTSConfig):
         """Create Azure OpenAI TTS plugin instance for LiveKit."""
-        return lk_openai.TTS.with_azure(
+        return lk_openai.TTS(
             model=config.model or "tts-1",
             voice=config.voice,
-            azure_endpoint=config.metadata["azure_endpoint"],
-            azure_deployment=config.metadata["azure_deployment"],
-            api_version=config.metadata.get("api_version", "2024-02-15-preview"),
-            api_key=config.metadata["api_key"]
+            client=_get_client(config.metadata)
         )
 
 
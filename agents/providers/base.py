@@ -4,13 +4,20 @@ Base classes for pluggable AI providers.
 The provider factory creates LiveKit plugin instances directly.
 """
 
-from typing import Optional, Dict, Any, Callable
-from dataclasses import dataclass
-from enum import Enum
+import time
+from typing import Optional, Dict, Any, Callable, Tuple
+from dataclasses import dataclass, field
+from enum import StrEnum
 
+import orjson
 
-class ProviderType(Enum):
-    """Supported AI provider types."""
+
+# Distinct configs kept in ProviderFactory's instance cache
+_INSTANCE_CACHE_MAXSIZE = 32
+
+
+class ProviderType(StrEnum):
+    """Supported AI provider types. Members compare and format as their string value."""
     OPENAI = "openai"
     AZURE = "azure"
     CUSTOM_HTTP = "custom_http"  # For HTTP-based custom endpoints
@@ -18,94 +25,131 @@ class ProviderType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class STTConfig:
     """Configuration for Speech-to-Text providers."""
     provider: ProviderType
     language: str = "en-US"
     model: Optional[str] = None
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
 
-
-@dataclass
+@dataclass(slots=True)
 class LLMConfig:
     """Configuration for Large Language Model providers."""
     provider: ProviderType
     model: str
     temperature: float = 0.7
     max_tokens: int = 150
-    metadata: Dict[str, Any] = None
-
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    # Sent first and unchanged on every request so the provider's prompt
+    # cache can match it; keep per-turn details out of it
+    system_prompt: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSConfig:
     """Configuration for Text-to-Speech providers."""
     provider: ProviderType
     voice: str
     model: Optional[str] = None
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
 
-
-@dataclass
+@dataclass(slots=True)
 class LLMMessage:
     """Message format for LLM conversations."""
     role: str
     content: str
-    metadata: Dict[str, Any] = None
-
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class ProviderFactory:
-    """Factory for creating LiveKit plugin instances."""
+    """
+    Factory for creating LiveKit plugin instances.
+
+    Instances are cached by config contents, so repeated requests for the same
+    configuration reuse one plugin (and its HTTP connection pool). Entries
+    expire after ``cache_ttl`` seconds so rotated credentials take effect,
+    and the oldest entry is dropped once ``_INSTANCE_CACHE_MAXSIZE`` configs
+    are cached. Dropped instances are not closed: sessions may still hold
+    them, and they are released with the last reference.
+    """
     
     _stt_registry: Dict[ProviderType, Callable[[STTConfig], Any]] = {}
     _llm_registry: Dict[ProviderType, Callable[[LLMConfig], Any]] = {}
     _tts_registry: Dict[ProviderType, Callable[[TTSConfig], Any]] = {}
+    _instance_cache: Dict[Tuple[str, bytes], Tuple[float, Any]] = {}
+    cache_ttl: float = 3600.0
 
     @classmethod
     def register_stt_provider(cls, provider_type: ProviderType, factory_func: Callable[[STTConfig], Any]) -> None:
         cls._stt_registry[provider_type] = factory_func
+        cls.clear_cache()
 
     @classmethod
     def register_llm_provider(cls, provider_type: ProviderType, factory_func: Callable[[LLMConfig], Any]) -> None:
         cls._llm_registry[provider_type] = factory_func
+        cls.clear_cache()
 
     @classmethod
     def register_tts_provider(cls, provider_type: ProviderType, factory_func: Callable[[TTSConfig], Any]) -> None:
         cls._tts_registry[provider_type] = factory_func
+        cls.clear_cache()
 
     @classmethod
-    def create_stt(cls, config: STTConfig) -> Any:
-        factory_func = cls._stt_registry.get(config.provider)
+    def register_many(
+        cls,
+        stt: Optional[Dict[ProviderType, Callable[[STTConfig], Any]]] = None,
+        llm: Optional[Dict[ProviderType, Callable[[LLMConfig], Any]]] = None,
+        tts: Optional[Dict[ProviderType, Callable[[TTSConfig], Any]]] = None,
+    ) -> None:
+        """Register several provider factories at once, keyed by provider type."""
+        if stt:
+            cls._stt_registry.update(stt)
+        if llm:
+            cls._llm_registry.update(llm)
+        if tts:
+            cls._tts_registry.update(tts)
+        cls.clear_cache()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget all cached instances; later calls create new ones."""
+        cls._instance_cache.clear()
+
+    @staticmethod
+    def _config_key(config: Any) -> bytes:
+        """Stable key for a config dataclass, including its metadata."""
+        return orjson.dumps(config, option=orjson.OPT_SORT_KEYS, default=repr)
+
+    @classmethod
+    def _create(cls, kind: str, registry: Dict[ProviderType, Callable], config: Any) -> Any:
+        factory_func = registry.get(config.provider)
         if not factory_func:
-            raise ValueError(f"No STT provider registered for {config.provider}")
-        return factory_func(config)
+            raise ValueError(f"No {kind} provider registered for {config.provider}")
+        key = (kind, cls._config_key(config))
+        now = time.monotonic()
+        cached = cls._instance_cache.get(key)
+        if cached is not None and now - cached[0] < cls.cache_ttl:
+            return cached[1]
+        instance = factory_func(config)
+        cache = cls._instance_cache
+        cache.pop(key, None)
+        if len(cache) >= _INSTANCE_CACHE_MAXSIZE:
+            # Dicts keep insertion order, so the first entry is the oldest
+            del cache[next(iter(cache))]
+        cache[key] = (now, instance)
+        return instance
+
+    @classmethod
+    def create_stt(cls, config: STTConfig) -> Any:
+        return cls._create("STT", cls._stt_registry, config)
 
     @classmethod
     def create_llm(cls, config: LLMConfig) -> Any:
-        factory_func = cls._llm_registry.get(config.provider)
-        if not factory_func:
-            raise ValueError(f"No LLM provider registered for {config.provider}")
-        return factory_func(config)
+        return cls._create("LLM", cls._llm_registry, config)
 
     @classmethod
     def create_tts(cls, config: TTSConfig) -> Any:
-        factory_func = cls._tts_registry.get(config.provider)
-        if not factory_func:
-            raise ValueError(f"No TTS provider registered for {config.provider}")
-        return factory_func(config)
+        return cls._create("TTS", cls._tts_registry, config)
@@ -20,7 +20,9 @@ class CustomProviderFactory:
         - endpoint_url: The HTTP endpoint for STT
         - api_key: Optional API key
         - headers: Optional additional headers
-        - request_timeout: Optional timeout in seconds
+        - request_timeout: Optional read timeout in seconds (default 30)
+        - connect_timeout: Optional connect timeout in seconds (default 2)
+        - audio_format: Optional "pcm" (default) or "wav"
         
         Example:
             config = STTConfig(
@@ -30,7 +32,8 @@ class CustomProviderFactory:
                     "endpoint_url": "https://api.vendor.com/v1/stt",
                     "api_key": "your-api-key",
                     "headers": {"X-Custom-Header": "value"},
-                    "request_timeout": 30
+                    "request_timeout": 30,
+                    "connect_timeout": 2
                 }
             )
         """
@@ -39,7 +42,9 @@ class CustomProviderFactory:
             api_key=config.metadata.get("api_key"),
             language=config.language,
             headers=config.metadata.get("headers"),
-            request_timeout=config.metadata.get("request_timeout", 30)
+            request_timeout=config.metadata.get("request_timeout", 30),
+            connect_timeout=config.metadata.get("connect_timeout", 2.0),
+            audio_format=config.metadata.get("audio_format", "pcm")
         )
     
     @staticmethod
@@ -2,10 +2,55 @@
 OpenAI provider factories that return LiveKit plugin instances.
 """
 
+import hashlib
+from typing import Dict, Optional
+
+import httpx
+import openai
 from livekit.plugins import openai as lk_openai
 from .base import STTConfig, LLMConfig, TTSConfig
 
 
+_http_client: Optional[httpx.AsyncClient] = None
+_clients: Dict[str, openai.AsyncOpenAI] = {}
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide HTTP client used by all OpenAI-compatible clients.
+
+    STT, LLM and TTS plugins share its keep-alive pool, so one set of TLS
+    connections serves all three instead of one per plugin.
+    """
+    global _http_client
+    if _http_client is None:
+        # Same timeouts and limits the plugins use for their own clients
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=15.0, read=5.0, write=5.0, pool=5.0),
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=50,
+                keepalive_expiry=120,
+            ),
+        )
+    return _http_client
+
+
+def _get_client(api_key: Optional[str]) -> openai.AsyncOpenAI:
+    """Return the shared OpenAI client for an API key (None: OPENAI_API_KEY)."""
+    key = hashlib.blake2b((api_key or "").encode(), digest_size=16).hexdigest()
+    client = _clients.get(key)
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=api_key,
+            max_retries=0,
+            http_client=get_shared_http_client(),
+        )
+        _clients[key] = client
+    return client
+
+
 class OpenAIProviderFactory:
     """Factory class for creating OpenAI plugin instances."""
     
@@ -15,7 +60,7 @@ class OpenAIProviderFactory:
         return lk_openai.STT(
             model=config.model or "whisper-1",
             language=config.language,
-            api_key=config.metadata.get("api_key")
+            client=_get_client(config.metadata.get("api_key"))
         )
     
     @staticmethod
@@ -24,7 +69,7 @@ class OpenAIProviderFactory:
         return lk_openai.LLM(
             model=config.model,
             temperature=config.temperature,
-            api_key=config.metadata.get("api_key")
+            client=_get_client(config.metadata.get("api_key"))
         )
     
     @staticmethod
@@ -33,7 +78,7 @@ class OpenAIProviderFactory:
         return lk_openai.TTS(
             model=config.model or "tts-1",
             voice=config.voice,
-            api_key=config.metadata.get("api_key")
+            client=_get_client(config.metadata.get("api_key"))
         )
 
 
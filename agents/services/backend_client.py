@@ -2,16 +2,316 @@
 Backend API client for LiveKit agents to communicate with FastAPI backend.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
-from datetime import datetime
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple, Union
+from datetime import datetime, timezone
 import aiohttp
+import httpx
+import msgspec
+import orjson
 
 from ..config.settings import Settings
+from ..providers.base import LLMMessage
 
 
 logger = logging.getLogger(__name__)
 
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def _iter_chunks(data: Union[bytes, bytearray, memoryview]) -> AsyncIterator[memoryview]:
+    """Yield zero-copy slices of a bytes-like object for streaming uploads."""
+    view = memoryview(data).cast("B")
+    for start in range(0, len(view), _UPLOAD_CHUNK_SIZE):
+        yield view[start:start + _UPLOAD_CHUNK_SIZE]
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize request payloads with orjson; datetimes are encoded natively."""
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+
+
+@dataclass(slots=True)
+class _MessageRow:
+    """One row of the recent-messages endpoint; other fields are ignored."""
+    role: str
+    content: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _MessagePage:
+    """Body of the recent-messages endpoint."""
+    messages: List[_MessageRow] = field(default_factory=list)
+
+
+# Decodes only the fields LLMMessage is built from, in a single C pass without
+# an intermediate list of dicts
+_decode_message_page = msgspec.json.Decoder(_MessagePage).decode
+
+
+# Analytics events are sent once this many are waiting, or after this many
+# seconds, whichever comes first
+_ANALYTICS_MAX_BATCH = 50
+_ANALYTICS_FLUSH_INTERVAL = 5.0
+_ANALYTICS_QUEUE_MAXSIZE = 1024
+
+
+class EventBatcher:
+    """
+    Collects fire-and-forget events and hands them to ``send`` in batches.
+
+    The background flusher starts with the first event, so the batcher can be
+    created outside a running event loop.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        max_batch: int = _ANALYTICS_MAX_BATCH,
+        flush_interval: float = _ANALYTICS_FLUSH_INTERVAL
+    ):
+        self._send = send
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=_ANALYTICS_QUEUE_MAXSIZE)
+        self._pending: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, event: Dict[str, Any]) -> None:
+        """Queue an event; never waits on the network."""
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Analytics queue full, dropping %s event", event.get("kind"))
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            self._pending.append(await queue.get())
+            deadline = loop.time() + self._flush_interval
+            while len(self._pending) < self._max_batch:
+                try:
+                    self._pending.append(
+                        await asyncio.wait_for(queue.get(), deadline - loop.time())
+                    )
+                except asyncio.TimeoutError:
+                    break
+            batch, self._pending = self._pending, []
+            # Shield so cancelling the flusher never drops an in-flight batch
+            await asyncio.shield(self._send(batch))
+
+    async def flush(self) -> None:
+        """Stop the background flusher and send everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        batch, self._pending = self._pending, []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._send(batch)
+
+
+class _Transport(Protocol):
+    """
+    HTTP transport used by BackendClient.
+
+    ``get``/``post`` return async context managers yielding a response with a
+    ``status`` attribute and awaitable ``read()``, ``json()`` and ``text()``,
+    i.e. the subset of ``aiohttp.ClientResponse`` the client relies on.
+    """
+
+    @property
+    def closed(self) -> bool: ...
+
+    def get(self, url: str, **kwargs: Any) -> Any: ...
+
+    def post(self, url: str, **kwargs: Any) -> Any: ...
+
+    def post_multipart(
+        self,
+        url: str,
+        fields: Dict[str, str],
+        file_field: str,
+        file_data: Union[bytes, bytearray, memoryview, AsyncIterable[bytes]],
+        filename: str,
+        content_type: str
+    ) -> Any: ...
+
+    async def close(self) -> None: ...
+
+
+class AiohttpTransport:
+    """HTTP/1.1 transport over a pooled aiohttp session (the default)."""
+
+    def __init__(self, settings: Settings):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=settings.backend_pool_size,
+                limit_per_host=settings.backend_pool_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            ),
+            timeout=aiohttp.ClientTimeout(total=30, connect=5),
+            headers={
+                "Authorization": f"Bearer {settings.backend_api_key}",
+                "Content-Type": "application/json"
+            },
+            json_serialize=_json_dumps
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+
+    def get(self, url: str, **kwargs: Any):
+        return self._session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):
+        return self._session.post(url, **kwargs)
+
+    def post_multipart(
+        self,
+        url: str,
+        fields: Dict[str, str],
+        file_field: str,
+        file_data: Union[bytes, bytearray, memoryview, AsyncIterable[bytes]],
+        filename: str,
+        content_type: str
+    ):
+        # Bytes-like buffers are streamed in slices; async iterables are sent
+        # chunked as they are produced
+        if isinstance(file_data, (bytes, bytearray, memoryview)):
+            file_data = _iter_chunks(file_data)
+        form_data = aiohttp.FormData()
+        form_data.add_field(
+            file_field,
+            file_data,
+            filename=filename,
+            content_type=content_type
+        )
+        for name, value in fields.items():
+            form_data.add_field(name, value)
+        return self._session.post(url, data=form_data)
+
+    async def close(self) -> None:
+        await self._session.close()
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class _HttpxResponse:
+    """Adapts an ``httpx.Response`` to the aiohttp-style response interface."""
+
+    __slots__ = ("_response", "status")
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self.status = response.status_code
+
+    async def read(self) -> bytes:
+        return self._response.content
+
+    async def json(self) -> Any:
+        return self._response.json()
+
+    async def text(self) -> str:
+        return self._response.text
+
+
+class HttpxTransport:
+    """
+    HTTP/2 transport over httpx.
+
+    Concurrent requests are multiplexed over a single connection per host
+    instead of each taking a pooled HTTP/1.1 connection. Requires the ``h2``
+    package (``httpx[http2]``).
+    """
+
+    def __init__(self, settings: Settings):
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.backend_pool_size,
+                max_keepalive_connections=settings.backend_pool_per_host,
+                keepalive_expiry=60.0
+            ),
+            # Content-Type is set per request so multipart uploads get their own
+            headers={"Authorization": f"Bearer {settings.backend_api_key}"}
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._client.is_closed
+
+    @asynccontextmanager
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        json: Any = None,
+        data: Optional[Union[bytes, bytearray, memoryview]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[_HttpxResponse]:
+        if json is not None:
+            data = orjson.dumps(json, option=_ORJSON_OPTIONS)
+        response = await self._client.request(
+            method,
+            url,
+            content=bytes(data) if data is not None else None,
+            params=params,
+            headers=_JSON_HEADERS
+        )
+        yield _HttpxResponse(response)
+
+    def get(self, url: str, **kwargs: Any):
+        return self._request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):
+        return self._request("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def post_multipart(
+        self,
+        url: str,
+        fields: Dict[str, str],
+        file_field: str,
+        file_data: Union[bytes, bytearray, memoryview, AsyncIterable[bytes]],
+        filename: str,
+        content_type: str
+    ) -> AsyncIterator[_HttpxResponse]:
+        # httpx multipart bodies must be in memory, so chunked sources are
+        # collected first
+        if isinstance(file_data, (bytes, bytearray, memoryview)):
+            content = bytes(file_data)
+        else:
+            content = b"".join([chunk async for chunk in file_data])
+        response = await self._client.post(
+            url,
+            data=fields,
+            files={file_field: (filename, content, content_type)}
+        )
+        yield _HttpxResponse(response)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
 
 class BackendClient:
     """
@@ -23,18 +323,26 @@ class BackendClient:
         self.settings = settings
         self.backend_url = settings.backend_api_url
         self.api_key = settings.backend_api_key
-        self.session: Optional[aiohttp.ClientSession] = None
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session."""
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-            )
-        return self.session
+        self._transport: Optional[_Transport] = None
+        self._closed = False
+        self._analytics = EventBatcher(self._send_analytics_batch)
+
+    async def _get_transport(self) -> _Transport:
+        """
+        Get or create the pooled HTTP transport.
+
+        ``settings.backend_http_version == "h2"`` selects the multiplexing
+        httpx transport; anything else uses aiohttp over HTTP/1.1. A closed
+        transport (e.g. after cleanup()) is replaced transparently, so warm
+        keep-alive connections are reused for every backend call.
+        """
+        if self._transport is None or self._transport.closed:
+            if self.settings.backend_http_version == "h2":
+                self._transport = HttpxTransport(self.settings)
+            else:
+                self._transport = AiohttpTransport(self.settings)
+            self._closed = False
+        return self._transport
 
     async def agent_joined(
         self,
@@ -46,8 +354,8 @@ class BackendClient:
         Returns conversation_id for tracking.
         """
         try:
-            session = await self._get_session()
-            async with session.post(
+            transport = await self._get_transport()
+            async with transport.post(
                 f"{self.backend_url}/api/v1/rooms/{room_name}/agent-joined",
                 json={
                     "agent_metadata": agent_metadata or {},
@@ -55,19 +363,17 @@ class BackendClient:
                 }
             ) as response:
                 if response.status == 200:
-                    result = await response.json()
+                    result = orjson.loads(await response.read())
                     conversation_id = result.get("conversation_id")
                     logger.info(f"Agent joined room {room_name}, conversation_id: {conversation_id}")
                     return conversation_id
                 else:
                     logger.error(f"Failed to notify agent joined: {response.status}")
                     # Generate fallback conversation ID
-                    import uuid
                     return str(uuid.uuid4())
         except Exception as e:
             logger.error(f"Error notifying agent joined: {e}", exc_info=True)
             # Generate fallback conversation ID
-            import uuid
             return str(uuid.uuid4())
 
     async def participant_connected(
@@ -78,26 +384,20 @@ class BackendClient:
     ) -> None:
         """
         Notify backend that a participant connected.
+
+        The event is queued and sent with the next analytics batch.
         """
-        try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.backend_url}/api/v1/analytics/participant-connected",
-                json={
-                    "room_name": room_name,
-                    "participant_identity": participant_identity,
-                    "metadata": participant_metadata,
-                    "timestamp": self._get_timestamp()
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.warning(f"Failed to log participant connected: {response.status}")
-        except Exception as e:
-            logger.error(f"Error logging participant connected: {e}", exc_info=True)
+        self._analytics.put({
+            "kind": "participant_connected",
+            "room_name": room_name,
+            "participant_identity": participant_identity,
+            "metadata": participant_metadata,
+            "timestamp": self._get_timestamp()
+        })
 
-    def _get_timestamp(self) -> str:
-        """Get current timestamp in ISO format."""
-        return datetime.utcnow().isoformat()
+    def _get_timestamp(self) -> datetime:
+        """Get the current UTC time; serialized to ISO 8601 by the JSON encoder."""
+        return datetime.now(timezone.utc)
 
     async def participant_disconnected(
         self,
@@ -105,22 +405,14 @@ class BackendClient:
         participant_identity: str,
         metadata: Dict[str, Any] = None
     ) -> None:
-        """Notify backend that a participant disconnected."""
-        try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.backend_url}/api/v1/analytics/participant-disconnected",
-                json={
-                    "room_name": room_name,
-                    "participant_identity": participant_identity,
-                    "metadata": metadata,
-                    "timestamp": self._get_timestamp()
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.warning(f"Failed to log participant disconnected: {response.status}")
-        except Exception as e:
-            logger.error(f"Error logging participant disconnected: {e}", exc_info=True)
+        """Notify backend that a participant disconnected (batched, like participant_connected)."""
+        self._analytics.put({
+            "kind": "participant_disconnected",
+            "room_name": room_name,
+            "participant_identity": participant_identity,
+            "metadata": metadata,
+            "timestamp": self._get_timestamp()
+        })
 
     async def store_transcription(
         self,
@@ -130,8 +422,8 @@ class BackendClient:
     ) -> None:
         """Store STT transcription and metadata."""
         try:
-            session = await self._get_session()
-            async with session.post(
+            transport = await self._get_transport()
+            async with transport.post(
                 f"{self.backend_url}/api/v1/conversations/{conversation_id}/transcriptions",
                 json={
                     "text": text,
@@ -148,9 +440,9 @@ class BackendClient:
                     )
         except Exception as e:
             logger.error(
-                f"Error storing transcription: {str(e)}",
-                extra={"conversation_id": conversation_id},
-                exc_info=True
+                "Error storing transcription: %r",
+                e,
+                extra={"conversation_id": conversation_id}
             )
 
     async def store_llm_response(
@@ -162,8 +454,8 @@ class BackendClient:
     ) -> None:
         """Store LLM conversation turn and metadata."""
         try:
-            session = await self._get_session()
-            async with session.post(
+            transport = await self._get_transport()
+            async with transport.post(
                 f"{self.backend_url}/api/v1/conversations/{conversation_id}/llm_turns",
                 json={
                     "prompt": prompt,
@@ -181,9 +473,9 @@ class BackendClient:
                     )
         except Exception as e:
             logger.error(
-                f"Error storing LLM response: {str(e)}",
-                extra={"conversation_id": conversation_id},
-                exc_info=True
+                "Error storing LLM response: %r",
+                e,
+                extra={"conversation_id": conversation_id}
             )
 
     async def store_tts_metadata(
@@ -194,8 +486,8 @@ class BackendClient:
     ) -> None:
         """Store TTS synthesis metadata."""
         try:
-            session = await self._get_session()
-            async with session.post(
+            transport = await self._get_transport()
+            async with transport.post(
                 f"{self.backend_url}/api/v1/conversations/{conversation_id}/tts_events",
                 json={
                     "text": text,
@@ -212,123 +504,53 @@ class BackendClient:
                     )
         except Exception as e:
             logger.error(
-                f"Error storing TTS metadata: {str(e)}",
-                extra={"conversation_id": conversation_id},
-                exc_info=True
+                "Error storing TTS metadata: %r",
+                e,
+                extra={"conversation_id": conversation_id}
             )
-    ) -> None:
-        """
-        Notify backend that a participant disconnected.
-        """
-        try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.backend_url}/api/v1/analytics/participant-disconnected",
-                json={
-                    "room_name": room_name,
-                    "participant_identity": participant_identity,
-                    "timestamp": self._get_timestamp()
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.warning(f"Failed to log participant disconnected: {response.status}")
-        except Exception as e:
-            logger.error(f"Error logging participant disconnected: {e}", exc_info=True)
 
-    async def store_transcription(
+    async def store_batch(
         self,
-        conversation_id: str,
-        text: str,
-        metadata: Dict[str, Any]
+        events: List[Tuple[str, str, Dict[str, Any], int]]
     ) -> None:
-        """Store STT transcription and metadata."""
-        try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.backend_url}/api/v1/conversations/{conversation_id}/transcriptions",
-                json={
-                    "text": text,
-                    "metadata": {
-                        **metadata,
-                        "timestamp": self._get_timestamp()
-                    }
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.error(
-                        f"Failed to store transcription: {await response.text()}",
-                        extra={"conversation_id": conversation_id}
-                    )
-        except Exception as e:
-            logger.error(
-                f"Error storing transcription: {str(e)}",
-                extra={"conversation_id": conversation_id},
-                exc_info=True
-            )
+        """
+        Store a batch of queued conversation events.
 
-    async def store_llm_response(
-        self,
-        conversation_id: str,
-        prompt: str,
-        response: str,
-        metadata: Dict[str, Any]
-    ) -> None:
-        """Store LLM conversation turn and metadata."""
-        try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.backend_url}/api/v1/conversations/{conversation_id}/llm_turns",
-                json={
-                    "prompt": prompt,
-                    "response": response,
-                    "metadata": {
-                        **metadata,
-                        "timestamp": self._get_timestamp()
-                    }
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.error(
-                        f"Failed to store LLM response: {await response.text()}",
-                        extra={"conversation_id": conversation_id}
-                    )
-        except Exception as e:
-            logger.error(
-                f"Error storing LLM response: {str(e)}",
-                extra={"conversation_id": conversation_id},
-                exc_info=True
-            )
+        Each event is a ``(conversation_id, kind, body, timestamp_ns)`` tuple
+        where ``kind`` is the conversation sub-resource (``transcriptions``,
+        ``llm_turns`` or ``tts_events``), ``body`` is the payload the
+        single-item endpoint accepts and ``timestamp_ns`` is when the event
+        happened (``time.time_ns()``). Events are grouped so each
+        (conversation, kind) pair costs one request to the matching
+        ``/batch`` endpoint.
+        """
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for conversation_id, kind, body, timestamp_ns in events:
+            body["metadata"] = {
+                **body.get("metadata", {}),
+                "timestamp": datetime.fromtimestamp(timestamp_ns / 1e9, timezone.utc)
+            }
+            groups.setdefault((conversation_id, kind), []).append(body)
 
-    async def store_tts_metadata(
-        self,
-        conversation_id: str,
-        text: str,
-        metadata: Dict[str, Any]
-    ) -> None:
-        """Store TTS synthesis metadata."""
-        try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.backend_url}/api/v1/conversations/{conversation_id}/tts_events",
-                json={
-                    "text": text,
-                    "metadata": {
-                        **metadata,
-                        "timestamp": self._get_timestamp()
-                    }
-                }
-            ) as response:
-                if response.status != 200:
-                    logger.error(
-                        f"Failed to store TTS metadata: {await response.text()}",
-                        extra={"conversation_id": conversation_id}
-                    )
-        except Exception as e:
-            logger.error(
-                f"Error storing TTS metadata: {str(e)}",
-                extra={"conversation_id": conversation_id},
-                exc_info=True
-            )
+        for (conversation_id, kind), items in groups.items():
+            try:
+                transport = await self._get_transport()
+                async with transport.post(
+                    f"{self.backend_url}/api/v1/conversations/{conversation_id}/{kind}/batch",
+                    json={"items": items}
+                ) as response:
+                    if response.status != 200:
+                        logger.error(
+                            f"Failed to store {kind} batch: {await response.text()}",
+                            extra={"conversation_id": conversation_id}
+                        )
+            except Exception as e:
+                logger.error(
+                    "Error storing %s batch: %r",
+                    kind,
+                    e,
+                    extra={"conversation_id": conversation_id}
+                )
 
     async def save_conversation_turn(
         self,
@@ -342,8 +564,8 @@ class BackendClient:
         Save a conversation turn (user message + assistant response).
         """
         try:
-            session = await self._get_session()
-            async with session.post(
+            transport = await self._get_transport()
+            async with transport.post(
                 f"{self.backend_url}/api/v1/conversations/save-turn",
                 json={
                     "room_name": room_name,
@@ -359,38 +581,45 @@ class BackendClient:
                 else:
                     logger.debug("Conversation turn saved successfully")
         except Exception as e:
-            logger.error(f"Error saving conversation turn: {e}", exc_info=True)
+            logger.error("Error saving conversation turn: %r", e)
 
     async def handle_file_upload(
         self,
         room_name: str,
         participant_identity: str,
-        data: bytes
+        data: Union[bytes, bytearray, memoryview, AsyncIterable[bytes]]
     ) -> Optional[Dict[str, Any]]:
         """
         Upload a file to the backend.
+
+        data may be a bytes-like buffer, streamed in 64 KB slices so no second
+        copy is made, or an async iterable of chunks (e.g. read from disk or a
+        track) that is sent chunked as it is produced, without ever holding
+        the whole file in memory. The HTTP/2 transport buffers the file first.
         """
         try:
-            session = await self._get_session()
-            
-            form_data = aiohttp.FormData()
-            form_data.add_field('file', data, filename='upload.bin')
-            form_data.add_field('room_name', room_name)
-            form_data.add_field('participant_identity', participant_identity)
+            transport = await self._get_transport()
             
-            async with session.post(
+            async with transport.post_multipart(
                 f"{self.backend_url}/api/v1/files/upload",
-                data=form_data
+                fields={
+                    'room_name': room_name,
+                    'participant_identity': participant_identity
+                },
+                file_field='file',
+                file_data=data,
+                filename='upload.bin',
+                content_type='application/octet-stream'
             ) as response:
                 if response.status == 200:
-                    result = await response.json()
+                    result = orjson.loads(await response.read())
                     logger.info(f"File uploaded successfully: {result.get('file_id')}")
                     return result
                 else:
                     logger.error(f"File upload failed: {response.status}")
                     return None
         except Exception as e:
-            logger.error(f"Error uploading file: {e}", exc_info=True)
+            logger.error("Error uploading file: %r", e)
             return None
 
     async def save_conversation(
@@ -402,8 +631,8 @@ class BackendClient:
         Save final conversation data to backend.
         """
         try:
-            session = await self._get_session()
-            async with session.post(
+            transport = await self._get_transport()
+            async with transport.post(
                 f"{self.backend_url}/api/v1/conversations/finalize",
                 json={
                     "room_name": room_name,
@@ -426,17 +655,44 @@ class BackendClient:
         Retrieve user context from backend (e.g., preferences, history).
         """
         try:
-            session = await self._get_session()
-            async with session.get(
+            transport = await self._get_transport()
+            async with transport.get(
                 f"{self.backend_url}/api/v1/users/{participant_identity}/context"
             ) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return orjson.loads(await response.read())
                 else:
                     logger.warning(f"Failed to get user context: {response.status}")
                     return None
         except Exception as e:
-            logger.error(f"Error getting user context: {e}", exc_info=True)
+            logger.error("Error getting user context: %r", e)
+            return None
+
+    async def get_relevant_context(
+        self,
+        query: str,
+        conversation_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Retrieve context relevant to a user message (e.g., knowledge base hits).
+        """
+        try:
+            transport = await self._get_transport()
+            async with transport.post(
+                f"{self.backend_url}/api/v1/context/relevant",
+                json={
+                    "query": query,
+                    "conversation_id": conversation_id
+                }
+            ) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    return data.get("context")
+                else:
+                    logger.warning(f"Failed to get relevant context: {response.status}")
+                    return None
+        except Exception as e:
+            logger.error("Error getting relevant context: %r", e)
             return None
 
     async def log_error(
@@ -448,45 +704,50 @@ class BackendClient:
     ) -> None:
         """
         Log an error to the backend for monitoring.
+
+        Fire and forget: the event goes out with the next analytics batch.
         """
+        self._analytics.put({
+            "kind": "error",
+            "room_name": room_name,
+            "error_type": error_type,
+            "error_message": error_message,
+            "stack_trace": stack_trace,
+            "timestamp": self._get_timestamp()
+        })
+
+    async def _send_analytics_batch(self, events: List[Dict[str, Any]]) -> None:
+        """Post queued analytics events in one request."""
         try:
-            session = await self._get_session()
-            async with session.post(
-                f"{self.backend_url}/api/v1/analytics/log-error",
-                json={
-                    "room_name": room_name,
-                    "error_type": error_type,
-                    "error_message": error_message,
-                    "stack_trace": stack_trace,
-                    "timestamp": self._get_timestamp()
-                }
+            transport = await self._get_transport()
+            async with transport.post(
+                f"{self.backend_url}/api/v1/analytics/batch",
+                json={"events": events}
             ) as response:
-                pass  # Fire and forget
+                if response.status != 200:
+                    logger.warning("Failed to send %d analytics events: %s", len(events), response.status)
         except Exception as e:
-            logger.error(f"Error logging error to backend: {e}")
+            logger.error("Error sending analytics batch: %r", e)
 
     async def get_recent_messages(
         self,
         conversation_id: str,
         limit: int = 10
-    ) -> list:
+    ) -> List[LLMMessage]:
         """
         Get recent conversation messages from backend.
         Returns list of LLMMessage objects.
         """
         try:
-            session = await self._get_session()
-            async with session.get(
+            transport = await self._get_transport()
+            async with transport.get(
                 f"{self.backend_url}/api/v1/conversations/{conversation_id}/messages",
                 params={"limit": limit}
             ) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    # Convert to LLMMessage objects
-                    from ..providers.base import LLMMessage
                     messages = [
-                        LLMMessage(role=msg["role"], content=msg["content"])
-                        for msg in data.get("messages", [])
+                        LLMMessage(role=row.role, content=row.content or "")
+                        for row in _decode_message_page(await response.read()).messages
                     ]
                     logger.info(f"Loaded {len(messages)} recent messages")
                     return messages
@@ -494,31 +755,80 @@ class BackendClient:
                     logger.warning(f"Failed to get recent messages: {response.status}")
                     return []
         except Exception as e:
-            logger.error(f"Error getting recent messages: {e}", exc_info=True)
+            logger.error("Error getting recent messages: %r", e)
             return []
 
+    async def append_conversation_messages(
+        self,
+        conversation_id: str,
+        new_messages: list
+    ) -> bool:
+        """
+        Append messages not yet persisted to a conversation.
+        Returns True if the backend accepted them.
+        """
+        if not new_messages:
+            return True
+        try:
+            transport = await self._get_transport()
+            # orjson encodes the LLMMessage dataclasses directly, so no
+            # intermediate list of dicts is built for large deltas
+            async with transport.post(
+                f"{self.backend_url}/api/v1/conversations/{conversation_id}/messages",
+                data=orjson.dumps({"messages": new_messages}, option=_ORJSON_OPTIONS)
+            ) as response:
+                if response.status == 200:
+                    logger.debug(f"Appended {len(new_messages)} messages")
+                    return True
+                logger.error(f"Failed to append conversation messages: {response.status}")
+                return False
+        except Exception as e:
+            logger.error("Error appending conversation messages: %r", e)
+            return False
+
     async def save_session(
         self,
-        session_data: Dict[str, Any]
+        session_data: Union[Dict[str, Any], bytes]
     ) -> None:
         """
         Save session summary to backend.
+
+        session_data may be a dict or an already serialized JSON document,
+        which is sent as-is without another encoding pass.
         """
         try:
-            session = await self._get_session()
-            async with session.post(
+            transport = await self._get_transport()
+            if isinstance(session_data, (bytes, bytearray, memoryview)):
+                request_kwargs = {"data": session_data}
+            else:
+                request_kwargs = {"json": session_data}
+            async with transport.post(
                 f"{self.backend_url}/api/v1/sessions/save",
-                json=session_data
+                **request_kwargs
             ) as response:
                 if response.status == 200:
-                    logger.info(f"Session saved: {session_data.get('room_name')}")
+                    logger.info("Session saved")
                 else:
                     logger.error(f"Failed to save session: {response.status}")
         except Exception as e:
-            logger.error(f"Error saving session: {e}", exc_info=True)
+            logger.error("Error saving session: %r", e)
+
+    async def flush(self) -> None:
+        """Send queued analytics events now; the client stays open for reuse."""
+        await self._analytics.flush()
+
+    async def __aenter__(self) -> "BackendClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.cleanup()
 
     async def cleanup(self):
-        """Close HTTP session."""
-        if self.session:
-            await self.session.close()
+        """Close HTTP session. Safe to call more than once."""
+        if self._closed:
+            return
+        await self._analytics.flush()
+        self._closed = True
+        if self._transport:
+            await self._transport.close()
             logger.info("Backend client session closed")
@@ -3,28 +3,70 @@ State manager for maintaining conversation and session state.
 Supports both Redis (production) and in-memory (development) backends.
 """
 
-import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import uuid
 
+import orjson
+
 from ..config.settings import Settings
 
 
 logger = logging.getLogger(__name__)
 
+_CONVERSATION_TTL = 86400  # 24 hours
+_FINALIZED_TTL = 604800  # 7 days
+
+# Reads of the same conversation within this many seconds share one result
+_READ_CACHE_TTL = 1.0
+_READ_CACHE_MAXSIZE = 1024
+
+
+# The room name is a hash tag ({...}) so all keys of one conversation map to
+# the same Redis Cluster slot, as the multi-key Lua scripts require
+def _header_key(room_name: str) -> str:
+    return f"conversation:{{{room_name}}}:header"
+
+
+def _metadata_key(room_name: str) -> str:
+    return f"conversation:{{{room_name}}}:metadata"
+
+
+def _messages_key(room_name: str) -> str:
+    return f"conversation:{{{room_name}}}:messages"
+
+
+def _legacy_key(room_name: str) -> str:
+    """Single JSON document per conversation, used before the split layout."""
+    return f"conversation:{room_name}"
+
+
+def _text(value: Any) -> Any:
+    """Decode a raw Redis value; the memory backend already returns str."""
+    return value.decode() if isinstance(value, bytes) else value
+
 
 class StateManager:
     """
     Manages application state across agent instances.
     Uses Redis for distributed state in production.
+
+    A conversation is stored as three keys so each update touches only what
+    changed: a header hash (id, room, participant, start/end times), a
+    metadata hash of JSON-encoded context values, and a message list.
+    Writes only apply while the header exists. Conversations still stored
+    in the older single JSON document are migrated to this layout the first
+    time they are read or written.
     """
 
     def __init__(self, settings: Settings):
         self.settings = settings
         self.backend = None
         self._use_redis = settings.redis_url is not None
+        # (room_name, include_messages) -> (fetched_at, conversation)
+        self._cache: Dict[Tuple[str, bool], Tuple[float, Dict[str, Any]]] = {}
 
     async def initialize(self):
         """Initialize state backend."""
@@ -38,6 +80,10 @@ class StateManager:
         
         await self.backend.initialize()
 
+    def _invalidate(self, room_name: str) -> None:
+        self._cache.pop((room_name, True), None)
+        self._cache.pop((room_name, False), None)
+
     async def create_conversation(
         self,
         room_name: str,
@@ -46,29 +92,140 @@ class StateManager:
         """Create a new conversation session."""
         conversation_id = str(uuid.uuid4())
         
-        conversation_data = {
-            "id": conversation_id,
-            "room_name": room_name,
-            "participant_identity": participant_identity,
-            "started_at": datetime.utcnow().isoformat(),
-            "messages": [],
-            "metadata": {}
-        }
+        self._invalidate(room_name)
+        header = _header_key(room_name)
+        async with self.backend.pipeline() as pipe:
+            pipe.hset(header, mapping={
+                "id": conversation_id,
+                "room_name": room_name,
+                "participant_identity": participant_identity,
+                "started_at": datetime.utcnow().isoformat()
+            })
+            pipe.expire(header, _CONVERSATION_TTL)
+            await pipe.execute()
         
-        await self.backend.set(
-            f"conversation:{room_name}",
-            json.dumps(conversation_data),
-            ttl=86400  # 24 hours
-        )
+        return conversation_id
+
+    async def create_conversation_and_track(
+        self,
+        room_name: str,
+        participant_identity: str,
+        conversation_id: Optional[str] = None
+    ) -> str:
+        """
+        Create a conversation and track its participant in one round trip.
+
+        Same effect as create_conversation followed by add_participant. Pass
+        the id the backend assigned (BackendClient.agent_joined) so the state
+        and the backend record refer to the same conversation; a new id is
+        generated only when there is none.
+        """
+        conversation_id = conversation_id or str(uuid.uuid4())
+        
+        self._invalidate(room_name)
+        header = _header_key(room_name)
+        async with self.backend.pipeline() as pipe:
+            pipe.hset(header, mapping={
+                "id": conversation_id,
+                "room_name": room_name,
+                "participant_identity": participant_identity,
+                "started_at": datetime.utcnow().isoformat()
+            })
+            pipe.expire(header, _CONVERSATION_TTL)
+            pipe.sadd(f"room:{room_name}:participants", participant_identity)
+            await pipe.execute()
         
         return conversation_id
 
-    async def get_conversation(self, room_name: str) -> Optional[Dict[str, Any]]:
-        """Get conversation data."""
-        data = await self.backend.get(f"conversation:{room_name}")
-        if data:
-            return json.loads(data)
-        return None
+    async def _migrate_legacy(self, room_name: str) -> bool:
+        """
+        Convert an old single-document conversation to the split layout.
+
+        Returns True if a legacy conversation was found and migrated.
+        """
+        data = await self.backend.get(_legacy_key(room_name))
+        if not data:
+            return False
+        legacy = orjson.loads(data)
+        messages = legacy.pop("messages", None) or []
+        metadata = legacy.pop("metadata", None) or {}
+        ttl = _FINALIZED_TTL if "ended_at" in legacy else _CONVERSATION_TTL
+
+        header = _header_key(room_name)
+        keys = [header]
+        async with self.backend.pipeline() as pipe:
+            pipe.hset(header, mapping={field: str(value) for field, value in legacy.items()})
+            if metadata:
+                keys.append(_metadata_key(room_name))
+                pipe.hset(_metadata_key(room_name), mapping={
+                    field: orjson.dumps(value) for field, value in metadata.items()
+                })
+            if messages:
+                keys.append(_messages_key(room_name))
+                pipe.rpush(_messages_key(room_name), *(orjson.dumps(m) for m in messages))
+            for key in keys:
+                pipe.expire(key, ttl)
+            pipe.delete(_legacy_key(room_name))
+            await pipe.execute()
+        self._invalidate(room_name)
+        logger.info("Migrated legacy conversation state for room %s", room_name)
+        return True
+
+    async def _write_existing(
+        self,
+        room_name: str,
+        write: Callable[[], Awaitable[bool]]
+    ) -> bool:
+        """
+        Run a write that only applies while the conversation exists.
+
+        A legacy conversation is migrated and the write retried once; returns
+        False if the room has no conversation at all.
+        """
+        if await write():
+            return True
+        return await self._migrate_legacy(room_name) and await write()
+
+    async def get_conversation(
+        self,
+        room_name: str,
+        include_messages: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get conversation data, with its messages unless include_messages is False.
+
+        Results are reused for up to a second unless this manager writes to
+        the conversation; treat the returned dict as read-only.
+        """
+        cache_key = (room_name, include_messages)
+        now = time.monotonic()
+        cached = self._cache.get(cache_key)
+        if cached is not None and now - cached[0] < _READ_CACHE_TTL:
+            return cached[1]
+
+        # Header, metadata and messages in one round trip
+        async with self.backend.pipeline() as pipe:
+            pipe.hgetall(_header_key(room_name))
+            pipe.hgetall(_metadata_key(room_name))
+            if include_messages:
+                pipe.lrange(_messages_key(room_name), 0, -1)
+            header, metadata, *messages = await pipe.execute()
+        if not header:
+            if await self._migrate_legacy(room_name):
+                return await self.get_conversation(room_name, include_messages)
+            return None
+        conversation = {_text(field): _text(value) for field, value in header.items()}
+        conversation["metadata"] = {
+            _text(field): orjson.loads(value) for field, value in metadata.items()
+        }
+        if include_messages:
+            conversation["messages"] = [orjson.loads(message) for message in messages[0]]
+
+        if len(self._cache) >= _READ_CACHE_MAXSIZE:
+            # Entries live for a second at most, so dropping them all is cheap
+            self._cache.clear()
+        self._cache[cache_key] = (now, conversation)
+        return conversation
 
     async def add_message(
         self,
@@ -77,12 +234,14 @@ class StateManager:
         content: str,
         metadata: Dict[str, Any]
     ) -> None:
-        """Add a message to the conversation."""
-        conversation = await self.get_conversation(room_name)
-        if not conversation:
-            logger.error(f"Conversation not found for room: {room_name}")
-            return
-        
+        """
+        Add a message to the conversation.
+
+        Messages are appended to a per-conversation list, so the cost does not
+        grow with the conversation and concurrent writers cannot overwrite
+        each other's messages. The existence check and append happen in one
+        server-side step, so unknown rooms never get orphan message lists.
+        """
         message = {
             "id": str(uuid.uuid4()),
             "role": role,
@@ -91,13 +250,18 @@ class StateManager:
             "metadata": metadata
         }
         
-        conversation["messages"].append(message)
-        
-        await self.backend.set(
-            f"conversation:{room_name}",
-            json.dumps(conversation),
-            ttl=86400
-        )
+        self._invalidate(room_name)
+        payload = orjson.dumps(message)
+        if not await self._write_existing(
+            room_name,
+            lambda: self.backend.rpush_if_exists(
+                _header_key(room_name),
+                _messages_key(room_name),
+                payload,
+                _CONVERSATION_TTL
+            )
+        ):
+            logger.error("Conversation not found for room: %s", room_name)
 
     async def add_participant(
         self,
@@ -125,16 +289,35 @@ class StateManager:
         """Get all participants in a room."""
         return await self.backend.smembers(f"room:{room_name}:participants")
 
+    async def count_participants(self, room_name: str) -> int:
+        """Number of participants in a room, without fetching them."""
+        return await self.backend.scard(f"room:{room_name}:participants")
+
+    async def has_participant(self, room_name: str, participant_identity: str) -> bool:
+        """Whether a participant is tracked in a room, without fetching the set."""
+        found, = await self.backend.smismember(
+            f"room:{room_name}:participants",
+            participant_identity
+        )
+        return found
+
     async def finalize_conversation(self, room_name: str) -> None:
-        """Mark conversation as complete."""
-        conversation = await self.get_conversation(room_name)
-        if conversation:
-            conversation["ended_at"] = datetime.utcnow().isoformat()
-            await self.backend.set(
-                f"conversation:{room_name}",
-                json.dumps(conversation),
-                ttl=604800  # Keep for 7 days
+        """Mark conversation as complete and keep it for 7 days."""
+        self._invalidate(room_name)
+        ended_at = datetime.utcnow().isoformat()
+        # Existence check, update and TTL refresh happen server-side in one step
+        if not await self._write_existing(
+            room_name,
+            lambda: self.backend.hset_existing(
+                _header_key(room_name),
+                "ended_at",
+                ended_at,
+                _FINALIZED_TTL,
+                _metadata_key(room_name),
+                _messages_key(room_name)
             )
+        ):
+            logger.warning("Cannot finalize, conversation not found for room: %s", room_name)
 
     async def set_user_context(
         self,
@@ -142,15 +325,19 @@ class StateManager:
         context_key: str,
         context_value: Any
     ) -> None:
-        """Set custom context for a conversation."""
-        conversation = await self.get_conversation(room_name)
-        if conversation:
-            conversation["metadata"][context_key] = context_value
-            await self.backend.set(
-                f"conversation:{room_name}",
-                json.dumps(conversation),
-                ttl=86400
+        """Set custom context for a conversation; a no-op if it does not exist."""
+        self._invalidate(room_name)
+        value = orjson.dumps(context_value)
+        await self._write_existing(
+            room_name,
+            lambda: self.backend.hset_if_exists(
+                _header_key(room_name),
+                _metadata_key(room_name),
+                context_key,
+                value,
+                _CONVERSATION_TTL
             )
+        )
 
     async def get_user_context(
         self,
@@ -158,10 +345,10 @@ class StateManager:
         context_key: str
     ) -> Optional[Any]:
         """Get custom context from conversation."""
-        conversation = await self.get_conversation(room_name)
-        if conversation:
-            return conversation.get("metadata", {}).get(context_key)
-        return None
+        value = await self.backend.hget(_metadata_key(room_name), context_key)
+        if value is None and await self._migrate_legacy(room_name):
+            value = await self.backend.hget(_metadata_key(room_name), context_key)
+        return orjson.loads(value) if value is not None else None
 
     async def cleanup(self):
         """Clean up resources."""
@@ -2,57 +2,264 @@
 In-memory state backend for development/testing.
 """
 
+import heapq
 import logging
-from typing import Optional, Dict, Set, List
+import time
+from typing import Any, Optional, Dict, Set, List, Tuple, Union
 
 
 logger = logging.getLogger(__name__)
 
+# Expired keys are dropped when touched, and swept in bulk every this many calls
+_SWEEP_INTERVAL = 256
+
+
+class MemoryPipeline:
+    """Queues backend calls and runs them on execute(), like a Redis pipeline."""
+
+    def __init__(self, backend: "MemoryStateBackend"):
+        self._backend = backend
+        self._calls: List[tuple] = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self._backend, name)
+
+        def queue(*args, **kwargs) -> "MemoryPipeline":
+            self._calls.append((method, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> List[Any]:
+        calls, self._calls = self._calls, []
+        return [await method(*args, **kwargs) for method, args, kwargs in calls]
+
+    async def __aenter__(self) -> "MemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._calls.clear()
+
 
 class MemoryStateBackend:
-    """In-memory implementation of state backend (for development)."""
+    """
+    In-memory implementation of state backend (for development).
+
+    TTLs are honoured like in Redis: a key past its deadline is dropped the
+    next time it is accessed, and a periodic sweep drops expired keys nobody
+    reads again, so long development runs do not grow without bound. Each
+    operation completes without awaiting, so concurrent tasks on the event
+    loop cannot interleave within one and no lock is needed.
+    """
 
     def __init__(self):
-        self.store: Dict[str, str] = {}
+        self.store: Dict[str, Union[str, bytes]] = {}
         self.sets: Dict[str, Set[str]] = {}
+        self.lists: Dict[str, List[Union[str, bytes]]] = {}
+        self.hashes: Dict[str, Dict[str, Union[str, bytes]]] = {}
+        # key -> monotonic deadline, plus a heap of (deadline, key) for sweeps;
+        # heap entries whose deadline no longer matches are stale and skipped
+        self._expires: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._ops = 0
+
+    def _exists(self, key: str) -> bool:
+        return any(key in d for d in (self.store, self.sets, self.lists, self.hashes))
+
+    def _drop(self, key: str) -> None:
+        self.store.pop(key, None)
+        self.sets.pop(key, None)
+        self.lists.pop(key, None)
+        self.hashes.pop(key, None)
+        self._expires.pop(key, None)
+
+    def _set_ttl(self, key: str, ttl: int) -> None:
+        deadline = time.monotonic() + ttl
+        self._expires[key] = deadline
+        heap = self._expiry_heap
+        heapq.heappush(heap, (deadline, key))
+        # Every refresh leaves a stale entry behind; rebuild from the live
+        # deadlines once they dominate, keeping the heap O(keys) amortized
+        if len(heap) > 2 * len(self._expires) + _SWEEP_INTERVAL:
+            self._expiry_heap = [(d, k) for k, d in self._expires.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def _check(self, key: str) -> None:
+        """Drop key if it has expired, sweeping all expired keys now and then."""
+        now = time.monotonic()
+        self._ops += 1
+        if self._ops >= _SWEEP_INTERVAL:
+            self._ops = 0
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                deadline, expired = heapq.heappop(heap)
+                if self._expires.get(expired) == deadline:
+                    self._drop(expired)
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= now:
+            self._drop(key)
 
     async def initialize(self):
         """Initialize (no-op for memory backend)."""
         logger.info("In-memory state backend initialized")
 
-    async def get(self, key: str) -> Optional[str]:
+    async def get(self, key: str) -> Optional[Union[str, bytes]]:
         """Get value by key."""
+        self._check(key)
         return self.store.get(key)
 
-    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
-        """Set value (TTL ignored in memory backend)."""
+    async def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
+        """Set value with optional TTL; without one any previous TTL is cleared."""
+        self._check(key)
         self.store[key] = value
+        if ttl:
+            self._set_ttl(key, ttl)
+        else:
+            self._expires.pop(key, None)
 
     async def delete(self, key: str) -> None:
         """Delete key."""
-        self.store.pop(key, None)
+        self._drop(key)
 
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
-        return key in self.store
+        self._check(key)
+        return self._exists(key)
 
     async def sadd(self, key: str, *values: str) -> None:
         """Add to set."""
+        self._check(key)
         if key not in self.sets:
             self.sets[key] = set()
         self.sets[key].update(values)
 
     async def srem(self, key: str, *values: str) -> None:
         """Remove from set."""
+        self._check(key)
         if key in self.sets:
             self.sets[key].difference_update(values)
 
     async def smembers(self, key: str) -> List[str]:
         """Get all set members."""
+        self._check(key)
         return list(self.sets.get(key, set()))
 
+    async def scard(self, key: str) -> int:
+        """Get set size."""
+        self._check(key)
+        return len(self.sets.get(key, ()))
+
+    async def smismember(self, key: str, *values: str) -> List[bool]:
+        """Test membership of several values in one call."""
+        self._check(key)
+        members = self.sets.get(key, set())
+        return [value in members for value in values]
+
+    async def hset(
+        self,
+        key: str,
+        field: Optional[str] = None,
+        value: Union[str, bytes, None] = None,
+        mapping: Optional[Dict[str, Union[str, bytes]]] = None
+    ) -> None:
+        """Set one hash field, or several via mapping."""
+        self._check(key)
+        fields = self.hashes.setdefault(key, {})
+        if field is not None:
+            fields[field] = value
+        if mapping:
+            fields.update(mapping)
+
+    async def hget(self, key: str, field: str) -> Optional[Union[str, bytes]]:
+        """Get one hash field."""
+        self._check(key)
+        return self.hashes.get(key, {}).get(field)
+
+    async def hgetall(self, key: str) -> Dict[str, Union[str, bytes]]:
+        """Get all fields of a hash."""
+        self._check(key)
+        return dict(self.hashes.get(key, {}))
+
+    async def hset_existing(
+        self,
+        key: str,
+        field: str,
+        value: Union[str, bytes],
+        ttl: int,
+        *related_keys: str
+    ) -> bool:
+        """Set a field on an existing hash and refresh the TTLs; False if it is missing."""
+        self._check(key)
+        if key not in self.hashes:
+            return False
+        self.hashes[key][field] = value
+        for related in (key, *related_keys):
+            self._check(related)
+            if self._exists(related):
+                self._set_ttl(related, ttl)
+        return True
+
+    async def rpush_if_exists(
+        self,
+        guard_key: str,
+        key: str,
+        value: Union[str, bytes],
+        ttl: int
+    ) -> bool:
+        """Append to a list and refresh both TTLs; False if guard_key is missing."""
+        self._check(guard_key)
+        if not self._exists(guard_key):
+            return False
+        self._check(key)
+        self.lists.setdefault(key, []).append(value)
+        self._set_ttl(guard_key, ttl)
+        self._set_ttl(key, ttl)
+        return True
+
+    async def hset_if_exists(
+        self,
+        guard_key: str,
+        key: str,
+        field: str,
+        value: Union[str, bytes],
+        ttl: int
+    ) -> bool:
+        """Set a hash field and refresh both TTLs; False if guard_key is missing."""
+        self._check(guard_key)
+        if not self._exists(guard_key):
+            return False
+        self._check(key)
+        self.hashes.setdefault(key, {})[field] = value
+        self._set_ttl(guard_key, ttl)
+        self._set_ttl(key, ttl)
+        return True
+
+    async def expire(self, key: str, ttl: int) -> None:
+        """Set TTL; a no-op for missing keys, as in Redis."""
+        self._check(key)
+        if self._exists(key):
+            self._set_ttl(key, ttl)
+
+    async def rpush(self, key: str, *values: Union[str, bytes]) -> None:
+        """Append to list."""
+        self._check(key)
+        self.lists.setdefault(key, []).extend(values)
+
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> List[Union[str, bytes]]:
+        """Get list items from start to end (inclusive, like Redis)."""
+        self._check(key)
+        stop = end + 1 if end != -1 else None
+        return self.lists.get(key, [])[start:stop]
+
+    def pipeline(self) -> MemoryPipeline:
+        """Pipeline with the same interface as RedisStateBackend.pipeline()."""
+        return MemoryPipeline(self)
+
     async def cleanup(self):
         """Clean up (no-op for memory backend)."""
         self.store.clear()
         self.sets.clear()
+        self.lists.clear()
+        self.hashes.clear()
+        self._expires.clear()
+        self._expiry_heap.clear()
         logger.info("In-memory state cleared")
@@ -3,12 +3,52 @@ Redis-based state backend for distributed state management.
 """
 
 import logging
-from typing import Optional, List
+from typing import Dict, Optional, List, Union
 import redis.asyncio as redis
 
 
 logger = logging.getLogger(__name__)
 
+# Set a field on a hash only if it exists, and refresh the TTL of it and any
+# related keys, in one atomic server-side step.
+# KEYS: hash, related keys...   ARGV: field, value, ttl
+_HSET_EXISTING_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+for i = 1, #KEYS do
+    redis.call('EXPIRE', KEYS[i], ARGV[3])
+end
+return 1
+"""
+
+# Append to a list only while a guard key (the conversation header) exists,
+# refreshing the TTL of both.   KEYS: guard, list   ARGV: value, ttl
+_RPUSH_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+
+# Set a hash field only while a guard key (the conversation header) exists,
+# refreshing the TTL of both.   KEYS: guard, hash   ARGV: field, value, ttl
+_HSET_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+
 
 class RedisStateBackend:
     """Redis implementation of state backend."""
@@ -16,21 +56,26 @@ class RedisStateBackend:
     def __init__(self, redis_url: str):
         self.redis_url = redis_url
         self.client: Optional[redis.Redis] = None
+        self._hset_existing = None
+        self._rpush_if_exists = None
+        self._hset_if_exists = None
 
     async def initialize(self):
         """Initialize Redis connection."""
-        self.client = await redis.from_url(
-            self.redis_url,
-            encoding="utf-8",
-            decode_responses=True
-        )
+        # Values are stored and returned as raw bytes; JSON payloads go through
+        # orjson without a str round trip
+        self.client = await redis.from_url(self.redis_url)
+        # Runs via EVALSHA, loading the script on first use
+        self._hset_existing = self.client.register_script(_HSET_EXISTING_SCRIPT)
+        self._rpush_if_exists = self.client.register_script(_RPUSH_IF_EXISTS_SCRIPT)
+        self._hset_if_exists = self.client.register_script(_HSET_IF_EXISTS_SCRIPT)
         logger.info("Redis state backend initialized")
 
-    async def get(self, key: str) -> Optional[str]:
+    async def get(self, key: str) -> Optional[bytes]:
         """Get value by key."""
         return await self.client.get(key)
 
-    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+    async def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
         """Set value with optional TTL."""
         if ttl:
             await self.client.setex(key, ttl, value)
@@ -56,7 +101,102 @@ class RedisStateBackend:
     async def smembers(self, key: str) -> List[str]:
         """Get all set members."""
         members = await self.client.smembers(key)
-        return list(members)
+        return [member.decode() for member in members]
+
+    async def hset(
+        self,
+        key: str,
+        field: Optional[str] = None,
+        value: Union[str, bytes, None] = None,
+        mapping: Optional[Dict[str, Union[str, bytes]]] = None
+    ) -> None:
+        """Set one hash field, or several via mapping."""
+        await self.client.hset(key, field, value, mapping=mapping)
+
+    async def hget(self, key: str, field: str) -> Optional[bytes]:
+        """Get one hash field."""
+        return await self.client.hget(key, field)
+
+    async def hgetall(self, key: str) -> Dict[bytes, bytes]:
+        """Get all fields of a hash."""
+        return await self.client.hgetall(key)
+
+    async def hset_existing(
+        self,
+        key: str,
+        field: str,
+        value: Union[str, bytes],
+        ttl: int,
+        *related_keys: str
+    ) -> bool:
+        """
+        Set a field on an existing hash and refresh TTLs atomically.
+
+        The TTL applies to the hash and every related key. Returns False,
+        changing nothing, if the hash does not exist.
+        """
+        result = await self._hset_existing(keys=[key, *related_keys], args=[field, value, ttl])
+        return bool(result)
+
+    async def rpush_if_exists(
+        self,
+        guard_key: str,
+        key: str,
+        value: Union[str, bytes],
+        ttl: int
+    ) -> bool:
+        """
+        Append to a list, only if guard_key exists, refreshing both TTLs.
+
+        Returns False, changing nothing, if the guard key is missing.
+        """
+        result = await self._rpush_if_exists(keys=[guard_key, key], args=[value, ttl])
+        return bool(result)
+
+    async def hset_if_exists(
+        self,
+        guard_key: str,
+        key: str,
+        field: str,
+        value: Union[str, bytes],
+        ttl: int
+    ) -> bool:
+        """
+        Set a hash field, only if guard_key exists, refreshing both TTLs.
+
+        Returns False, changing nothing, if the guard key is missing.
+        """
+        result = await self._hset_if_exists(keys=[guard_key, key], args=[field, value, ttl])
+        return bool(result)
+
+    async def expire(self, key: str, ttl: int) -> None:
+        """Set a key's TTL in seconds."""
+        await self.client.expire(key, ttl)
+
+    async def rpush(self, key: str, *values: Union[str, bytes]) -> None:
+        """Append to list."""
+        await self.client.rpush(key, *values)
+
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> List[bytes]:
+        """Get list items from start to end (inclusive)."""
+        return await self.client.lrange(key, start, end)
+
+    def pipeline(self) -> "redis.client.Pipeline":
+        """
+        Queue several commands and send them in one round trip.
+
+        Commands are queued without awaiting; ``await pipe.execute()`` returns
+        their results in order.
+        """
+        return self.client.pipeline(transaction=False)
+
+    async def scard(self, key: str) -> int:
+        """Get set size."""
+        return await self.client.scard(key)
+
+    async def smismember(self, key: str, *values: str) -> List[bool]:
+        """Test membership of several values in one call."""
+        return [bool(found) for found in await self.client.smismember(key, values)]
 
     async def cleanup(self):
         """Close Redis connection."""
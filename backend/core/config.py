@@ -71,6 +71,8 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
+        # Parsed once at import; treat as a read-only snapshot
+        frozen = True
 
 
 settings = Settings()
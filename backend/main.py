@@ -5,6 +5,7 @@ FastAPI backend application.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .core.config import settings
 from .core.logging import setup_logging
@@ -23,7 +24,8 @@ app = FastAPI(
     version="1.0.0",
     description="Voice Assistant Backend API",
     docs_url="/api/docs" if settings.debug else None,
-    redoc_url="/api/redoc" if settings.debug else None
+    redoc_url="/api/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse
 )
 
 # Middleware